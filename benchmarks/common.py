@@ -0,0 +1,56 @@
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+
+@dataclass(frozen=True)
+class Timing:
+    runs: int
+    total: float
+    p50: float
+    p95: float
+    p99: float
+
+    @property
+    def per_second(self) -> float:
+        return self.runs / self.total if self.total else 0.0
+
+
+def summarize(samples: list[float]) -> Timing:
+    ordered = sorted(samples)
+    if len(ordered) > 1:
+        quantiles = statistics.quantiles(ordered, n=100, method='inclusive')
+        p50, p95, p99 = quantiles[49], quantiles[94], quantiles[98]
+    else:
+        p50 = p95 = p99 = ordered[0]
+    return Timing(runs=len(ordered), total=sum(ordered), p50=p50, p95=p95, p99=p99)
+
+
+async def measure(call: Callable[[], Awaitable[Any]], runs: int, warmup: int = 3) -> Timing:
+    for _ in range(warmup):
+        await call()
+
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def payload_size(values: Any) -> int:
+    """Приблизительный объём полезных данных в строках результата, байт."""
+    if isinstance(values, str):
+        return len(values.encode())
+    if isinstance(values, (list, tuple)):
+        return sum(payload_size(value) for value in values)
+    if hasattr(values, '__dataclass_fields__'):
+        return sum(payload_size(getattr(values, name)) for name in values.__dataclass_fields__)
+    return 8
+
+
+def format_timing(name: str, timing: Timing) -> str:
+    return '%-40s %8.1f ops/s  p50 %7.2f ms  p95 %7.2f ms  p99 %7.2f ms' % (
+        name, timing.per_second, timing.p50 * 1000, timing.p95 * 1000, timing.p99 * 1000,
+    )
@@ -0,0 +1,110 @@
+"""Postgres для бенчмарков: существующий, из docker-compose.yaml или временный кластер initdb.
+
+Настройки подключения передаются через переменные окружения PSQL_SETTINGS__*,
+которые читает src.config, поэтому бенчмарки и alembic видят одну и ту же базу.
+"""
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from src.config import PostgresSettings, settings
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODES = ('existing', 'docker', 'initdb')
+
+
+def use_settings(**values: str | int) -> None:
+    """Переопределяет настройки Postgres для текущего процесса и дочерних."""
+    for name, value in values.items():
+        os.environ['PSQL_SETTINGS__%s' % name] = str(value)
+    settings.cache_clear()
+
+
+def _start_docker() -> None:
+    subprocess.run(['docker', 'compose', 'up', '-d', 'postgres'], cwd=ROOT, check=True)
+    # Порт проброшен в docker-compose.yaml, учётные данные берутся оттуда же.
+    use_settings(POSTGRES_HOST='localhost', POSTGRES_PORT=15432)
+
+
+@contextmanager
+def _initdb_cluster(port: int) -> Iterator[None]:
+    directory = tempfile.mkdtemp(prefix='blog-bench-')
+    data = os.path.join(directory, 'data')
+    user, database = 'bench', 'bench'
+    try:
+        subprocess.run(
+            ['initdb', '-D', data, '-U', user, '--auth=trust', '--encoding=UTF8', '--no-sync'],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        subprocess.run(
+            [
+                'pg_ctl', '-D', data, '-l', os.path.join(directory, 'postgres.log'), '-w',
+                '-o', '-p %d -k %s -c fsync=off -c shared_buffers=256MB' % (port, directory),
+                'start',
+            ],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        subprocess.run(['createdb', '-h', directory, '-p', str(port), '-U', user, database], check=True)
+        use_settings(
+            POSTGRES_HOST='localhost',
+            POSTGRES_PORT=port,
+            POSTGRES_USER=user,
+            POSTGRES_PASSWORD='',
+            POSTGRES_DB=database,
+        )
+        yield
+    finally:
+        subprocess.run(['pg_ctl', '-D', data, '-m', 'fast', 'stop'], stdout=subprocess.DEVNULL)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+async def wait_ready(psql_settings: PostgresSettings, timeout: float = 60.0) -> None:
+    import asyncpg
+
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        try:
+            connection = await asyncpg.connect(
+                host=psql_settings.POSTGRES_HOST,
+                port=psql_settings.POSTGRES_PORT,
+                user=psql_settings.POSTGRES_USER,
+                password=psql_settings.POSTGRES_PASSWORD,
+                database=psql_settings.POSTGRES_DB,
+            )
+        except (OSError, asyncpg.PostgresError):
+            if asyncio.get_running_loop().time() > deadline:
+                raise
+            await asyncio.sleep(0.5)
+            continue
+        await connection.close()
+        return
+
+
+def migrate() -> None:
+    subprocess.run([sys.executable, '-m', 'alembic', 'upgrade', 'head'], cwd=ROOT, check=True)
+
+
+@contextmanager
+def benchmark_database(mode: str, port: int = 15440) -> Iterator[PostgresSettings]:
+    """Поднимает базу выбранным способом, накатывает миграции и отдаёт её настройки."""
+    if mode == 'initdb':
+        with _initdb_cluster(port):
+            asyncio.run(wait_ready(settings().psql_settings))
+            migrate()
+            yield settings().psql_settings
+        return
+
+    if mode == 'docker':
+        _start_docker()
+    asyncio.run(wait_ready(settings().psql_settings))
+    migrate()
+    yield settings().psql_settings
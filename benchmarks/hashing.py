@@ -0,0 +1,68 @@
+"""Задержка цикла событий при конкурентных логинах.
+
+Фоновая задача просыпается каждые --tick мс и замеряет опоздание, пока
+выполняется --logins одновременных проверок пароля: синхронно в цикле
+событий и через HashingPool.
+
+Запуск: python -m benchmarks.hashing --logins 50 --rounds 12
+"""
+import argparse
+import asyncio
+import time
+
+from passlib.context import CryptContext
+
+from benchmarks.common import summarize
+from src.application.services.hashing import HashingPool
+
+
+async def measure_lag(work, tick: float) -> tuple[float, list[float]]:
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            expected = time.perf_counter() + tick
+            await asyncio.sleep(tick)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    ticker_task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticker_task
+    return elapsed, lags
+
+
+async def main(logins: int, rounds: int, workers: int, tick: float) -> None:
+    hasher = CryptContext(schemes=['bcrypt'], bcrypt__rounds=rounds)
+    encoded = hasher.hash('password')
+    pool = HashingPool(workers=workers, queue_limit=logins)
+
+    async def verify_inline():
+        async def login():
+            hasher.verify('password', encoded)
+        await asyncio.gather(*(login() for _ in range(logins)))
+
+    async def verify_in_pool():
+        await asyncio.gather(*(pool.run(hasher.verify, 'password', encoded) for _ in range(logins)))
+
+    for name, work in (('inline', verify_inline), ('pool', verify_in_pool)):
+        elapsed, lags = await measure_lag(work, tick)
+        lag = summarize(lags or [0.0])
+        print('%-8s total %7.1f ms  loop lag p50 %7.2f ms  p99 %7.2f ms  max %7.2f ms' % (
+            name, elapsed * 1000, lag.p50 * 1000, lag.p99 * 1000, max(lags or [0.0]) * 1000,
+        ))
+
+    pool.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--logins', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=12)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--tick', type=float, default=0.005)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.rounds, args.workers, args.tick))
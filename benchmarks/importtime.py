@@ -0,0 +1,99 @@
+"""Время импорта пакетов приложения.
+
+Импортирует все модули src.application и src.infrastructure в отдельном
+интерпретаторе под python -X importtime, печатает самые тяжёлые импорты и
+завершается с кодом 1, если суммарное время превышает --budget-ms
+(по умолчанию BUDGET_MS). tests/test_importtime.py проверяет бюджет только
+при заданной IMPORTTIME_BUDGET_MS: время импорта зависит от машины и её
+загрузки, и на общем CI такая проверка нестабильна.
+
+Запуск: python -m benchmarks.importtime --top 15
+"""
+import argparse
+import pkgutil
+import subprocess
+import sys
+from dataclasses import dataclass
+from importlib.util import find_spec
+
+PACKAGES = ('src.application', 'src.infrastructure')
+# env.py выполняется только внутри alembic.
+EXCLUDED = ('src.infrastructure.migrations',)
+
+# Суммарный бюджет с запасом на шум CI; основную часть занимают SQLAlchemy
+# и asyncpg, которые src.infrastructure импортирует напрямую.
+BUDGET_MS = 1000.0
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def package_modules(packages: tuple[str, ...] = PACKAGES) -> list[str]:
+    modules = []
+    for package in packages:
+        modules.append(package)
+        path = find_spec(package).submodule_search_locations
+        for info in pkgutil.walk_packages(path, prefix=package + '.'):
+            if not info.name.startswith(EXCLUDED):
+                modules.append(info.name)
+    return modules
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings.append(ImportTiming(
+            module=name.strip(),
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=(len(name) - len(name.lstrip())) // 2,
+        ))
+    return timings
+
+
+def measure_imports(modules: list[str]) -> list[ImportTiming]:
+    code = ''.join('import %s\n' % module for module in modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def total_ms(timings: list[ImportTiming]) -> float:
+    # Верхний уровень вложенности — модули, импортированные самим кодом.
+    return sum(timing.cumulative_us for timing in timings if timing.depth == 0) / 1000
+
+
+def main(budget_ms: float, top: int) -> int:
+    timings = measure_imports(package_modules())
+    total = total_ms(timings)
+
+    for timing in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+        print('%-60s %8.1f ms  (self %6.1f ms)' % (
+            timing.module, timing.cumulative_us / 1000, timing.self_us / 1000,
+        ))
+    print('%-60s %8.1f ms' % ('total', total))
+
+    if total > budget_ms:
+        print('Превышен бюджет времени импорта: %.1f ms > %.1f ms' % (total, budget_ms), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+    sys.exit(main(args.budget_ms, args.top))
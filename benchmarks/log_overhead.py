@@ -0,0 +1,58 @@
+"""Накладные расходы логирования на один запрос.
+
+Запрос имитируется несколькими вызовами logger.info в стиле сервисов.
+Сравниваются: логирование выключено (WARNING), синхронные обработчики,
+очередь, очередь с JSON и очередь с выборкой 1%.
+
+Запуск: python -m benchmarks.log_overhead --runs 20000 --calls 5
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from contextlib import redirect_stderr
+
+from benchmarks.common import summarize
+from src.infrastructure.logging_config import configure_logging, stop_logging
+
+logger = logging.getLogger('src.application.services.auth')
+
+MODES = {
+    'off': dict(level=logging.WARNING),
+    'sync': dict(),
+    'queued': dict(queued=True),
+    'queued+json': dict(queued=True, json_format=True),
+    'queued+sampling': dict(queued=True, sampling={'src.application.services': 0.01}),
+}
+
+
+def request(calls: int) -> None:
+    for _ in range(calls):
+        logger.info('msg details: успешное завершение\nservice func: %s.', 'decode_token')
+
+
+def main(runs: int, calls: int) -> None:
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull:
+        for name, options in MODES.items():
+            with redirect_stderr(devnull):
+                configure_logging(filename=os.path.join(directory, '%s.log' % name), **options)
+                samples = []
+                for _ in range(runs):
+                    started = time.perf_counter()
+                    request(calls)
+                    samples.append(time.perf_counter() - started)
+                stop_logging()
+
+            timing = summarize(samples)
+            print('%-16s p50 %7.2f us  p99 %7.2f us  mean %7.2f us' % (
+                name, timing.p50 * 1e6, timing.p99 * 1e6, timing.total / timing.runs * 1e6,
+            ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=20000)
+    parser.add_argument('--calls', type=int, default=5)
+    args = parser.parse_args()
+    main(args.runs, args.calls)
@@ -0,0 +1,46 @@
+"""Накладные расходы метрик на вызов метода сервиса.
+
+Один и тот же метод PostService с репозиторием-заглушкой вызывается без
+обёртки @timed, с выключенным реестром и с включённым. Разница между
+первыми двумя — цена выключенных метрик, между первым и третьим — цена
+гистограммы.
+
+Запуск: python -m benchmarks.metrics_overhead --runs 200000
+"""
+import argparse
+import asyncio
+import time
+
+from src.application.services.post import PostService
+from src.metrics import disable_metrics, enable_metrics, registry
+
+
+class StubRepository:
+    async def get_post_by_id(self, post_id: str):
+        return None
+
+
+async def measure(method, service: PostService, runs: int) -> float:
+    started = time.perf_counter()
+    for _ in range(runs):
+        await method(service, 'post')
+    return (time.perf_counter() - started) / runs
+
+
+async def main(runs: int) -> None:
+    service = PostService(StubRepository(), None)
+    plain = PostService.get_post_by_id.__wrapped__
+    timed = PostService.get_post_by_id
+
+    for name, method, enabled in (('plain', plain, False), ('timed, off', timed, False), ('timed, on', timed, True)):
+        enable_metrics() if enabled else disable_metrics()
+        await measure(method, service, runs // 10)
+        print('%-12s %7.3f us/call' % (name, await measure(method, service, runs) * 1e6))
+    disable_metrics()
+    print('render: %d bytes' % len(registry.render()))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=200000)
+    asyncio.run(main(parser.parse_args().runs))
@@ -0,0 +1,42 @@
+"""Сравнение полной ленты (ORM + joinedload) и проекции кратких описаний.
+
+Запуск на заполненной базе: python -m benchmarks.projection --limit 100 --runs 200
+"""
+import argparse
+import asyncio
+
+from benchmarks.common import format_timing, measure, payload_size
+from src.config import settings
+from src.infrastructure.database import new_session_maker
+from src.infrastructure.repository.post import PostRepository
+
+
+async def main(limit: int, runs: int, excerpt_length: int) -> None:
+    session_maker = new_session_maker(settings().psql_settings)
+
+    async with session_maker() as session:
+        repository = PostRepository(session)
+
+        full_rows = await repository.get_post_list_by_limit(skip=0, limit=limit)
+        summary_rows = (await repository.get_post_summaries(limit=limit, excerpt_length=excerpt_length)).items
+
+        full = await measure(lambda: repository.get_post_list_by_limit(skip=0, limit=limit), runs)
+        summary = await measure(
+            lambda: repository.get_post_summaries(limit=limit, excerpt_length=excerpt_length), runs
+        )
+
+    await session_maker.kw['bind'].dispose()
+
+    print(format_timing('get_post_list_by_limit', full))
+    print(format_timing('get_post_summaries', summary))
+    print('rows/s: %.0f vs %.0f' % (full.per_second * len(full_rows), summary.per_second * len(summary_rows)))
+    print('payload per page: %d vs %d bytes' % (payload_size(full_rows), payload_size(summary_rows)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--excerpt-length', type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.limit, args.runs, args.excerpt_length))
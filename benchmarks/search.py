@@ -0,0 +1,41 @@
+"""Задержка полнотекстового поиска по постам.
+
+Рассчитан на базу с 1M+ постов (см. генератор тестовых данных).
+Запуск: python -m benchmarks.search --runs 200 --limit 20 python postgres "быстрый старт"
+"""
+import argparse
+import asyncio
+
+from benchmarks.common import format_timing, measure
+from src.config import settings
+from src.infrastructure.database import new_session_maker
+from src.infrastructure.repository.post import PostRepository
+
+
+async def main(queries: list[str], limit: int, runs: int) -> None:
+    session_maker = new_session_maker(settings().psql_settings)
+
+    async with session_maker() as session:
+        repository = PostRepository(session)
+
+        for search_query in queries:
+            first_page = await repository.search_posts(search_query, limit=limit)
+            timing = await measure(lambda: repository.search_posts(search_query, limit=limit), runs)
+            print(format_timing('first page: %s' % search_query, timing))
+
+            if first_page and first_page.next_cursor:
+                timing = await measure(
+                    lambda: repository.search_posts(search_query, cursor=first_page.next_cursor, limit=limit), runs
+                )
+                print(format_timing('second page: %s' % search_query, timing))
+
+    await session_maker.kw['bind'].dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('queries', nargs='+')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.queries, args.limit, args.runs))
@@ -0,0 +1,264 @@
+"""Генератор больших синтетических наборов данных для нагрузочных тестов.
+
+Данные полностью определяются seed и параметрами: идентификаторы строятся
+из seed и номера строки, а у каждого куска строк свой генератор случайных
+чисел, поэтому результат не зависит от числа процессов. Распределения
+приближены к реальному блогу:
+
+- посты по авторам распределены по закону Ципфа (--zipf): у немногих
+  авторов тысячи постов, у большинства единицы;
+- длина текста логнормальная, от пары предложений до длинных статей;
+- доля опубликованных, черновиков и удалённых задаётся --published и
+  --deleted.
+
+Строки генерируются и загружаются параллельно в --workers процессах,
+каждый через собственное соединение и бинарный COPY. Вторичные индексы
+из моделей на время загрузки удаляются и строятся заново в конце, затем
+пересчитываются счётчики и собирается статистика.
+
+Запуск: python -m benchmarks.seed --posts 10000000 --authors 200000 --workers 8 --seed 1
+"""
+import argparse
+import asyncio
+import bisect
+import hashlib
+import itertools
+import math
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from sqlalchemy import Index, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.schema import CreateIndex, DropIndex
+
+from src.config import settings
+from src.infrastructure.database import new_session_maker
+from src.infrastructure.models import Author, Post
+from src.infrastructure.repository.bulk import copy_records
+from src.infrastructure.repository.counters import rebuild_counters
+
+WORDS = (
+    'python', 'postgres', 'asyncio', 'индекс', 'запрос', 'кэш', 'быстрый', 'старт', 'сервис', 'очередь',
+    'транзакция', 'репликация', 'шардирование', 'миграция', 'профилирование', 'latency', 'throughput',
+    'архитектура', 'блог', 'заметки', 'производительность', 'память', 'поток', 'события', 'сеть',
+)
+SYLLABLES = ('ка', 'ро', 'ми', 'ла', 'то', 'не', 'ва', 'ду', 'зе', 'по', 'ри', 'со', 'ти', 'ша', 'ю', 'ан', 'ор', 'ел')
+FIRST_NAMES = ('Анна', 'Иван', 'Мария', 'Олег', 'Елена', 'Пётр', 'Ольга', 'Сергей', 'Дарья', 'Адель', 'Нина', 'Артём')
+LAST_NAMES = ('Иванов', 'Петров', 'Смирнов', 'Кузнецов', 'Попов', 'Волков', 'Хамзин', 'Соколов', 'Лебедев', 'Козлов')
+EPOCH = datetime(2024, 1, 1)
+
+AUTHOR_COLUMNS = tuple(column.name for column in Author.__table__.columns)
+# Вычисляемые колонки (search_vector) заполняет сама база.
+POST_COLUMNS = tuple(column.name for column in Post.__table__.columns if column.computed is None)
+
+# Строк в одном куске: кусок — единица работы процесса и одна транзакция COPY.
+CHUNK_ROWS = 50000
+
+
+@dataclass(frozen=True)
+class SeedPlan:
+    posts: int
+    authors: int
+    seed: int = 1
+    zipf: float = 1.1
+    published: float = 0.7
+    deleted: float = 0.05
+    days: int = 730
+    text_words: int = 120
+
+
+def _seed_prefix(seed: int, kind: str) -> int:
+    return int.from_bytes(hashlib.sha256(f'{seed}:{kind}'.encode()).digest()[:8], 'big') << 64
+
+
+def _row_uuid(prefix: int, number: int) -> uuid.UUID:
+    return uuid.UUID(int=prefix | number, version=4)
+
+
+@lru_cache(maxsize=1)
+def _vocabulary(seed: int, size: int = 5000) -> list[str]:
+    rng = random.Random(f'{seed}:vocabulary')
+    words = list(WORDS)
+    while len(words) < size:
+        words.append(''.join(rng.choices(SYLLABLES, k=rng.randint(2, 5))))
+    return words
+
+
+@lru_cache(maxsize=1)
+def _author_popularity(plan: SeedPlan) -> tuple[list[float], list[int]]:
+    """Накопленные веса рангов по Ципфу и номера авторов в порядке ранга."""
+    cumulative = list(itertools.accumulate(1 / rank ** plan.zipf for rank in range(1, plan.authors + 1)))
+    # Ранги перемешаны, чтобы популярные авторы не шли подряд по номеру.
+    order = list(range(plan.authors))
+    random.Random(f'{plan.seed}:author-order').shuffle(order)
+    return cumulative, order
+
+
+def author_rows(plan: SeedPlan, start: int, stop: int) -> Iterator[tuple]:
+    rng = random.Random(f'{plan.seed}:authors:{start}')
+    prefix = _seed_prefix(plan.seed, 'author')
+    for number in range(start, stop):
+        row = {
+            'uuid': _row_uuid(prefix, number),
+            'name': '%s %s' % (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)),
+            'email': 'author%d@example.com' % number,
+        }
+        yield tuple(row[column] for column in AUTHOR_COLUMNS)
+
+
+def post_rows(plan: SeedPlan, start: int, stop: int) -> Iterator[tuple]:
+    rng = random.Random(f'{plan.seed}:posts:{start}')
+    post_prefix = _seed_prefix(plan.seed, 'post')
+    author_prefix = _seed_prefix(plan.seed, 'author')
+    vocabulary = _vocabulary(plan.seed)
+    cumulative, authors = _author_popularity(plan)
+    mu = math.log(max(plan.text_words, 1))
+    window = plan.days * 24 * 3600
+
+    for number in range(start, stop):
+        rank = bisect.bisect_left(cumulative, rng.random() * cumulative[-1])
+        status = rng.random()
+        created_at = EPOCH + timedelta(seconds=rng.randrange(window))
+        is_deleted = status >= 1 - plan.deleted
+
+        row = {
+            'uuid': _row_uuid(post_prefix, number),
+            'title': ' '.join(rng.choices(vocabulary, k=rng.randint(2, 8))).capitalize(),
+            'text': ' '.join(rng.choices(vocabulary, k=min(5000, max(5, int(rng.lognormvariate(mu, 0.9)))))),
+            'is_published': status < plan.published,
+            'is_deleted': is_deleted,
+            'created_at': created_at,
+            # Удалены в течение месяца после создания.
+            'deleted_at': created_at + timedelta(seconds=rng.randrange(30 * 24 * 3600)) if is_deleted else None,
+            'author_id': _row_uuid(author_prefix, authors[min(rank, plan.authors - 1)]),
+        }
+        yield tuple(row[column] for column in POST_COLUMNS)
+
+
+def _chunks(total: int) -> list[tuple[int, int]]:
+    return [(start, min(start + CHUNK_ROWS, total)) for start in range(0, total, CHUNK_ROWS)]
+
+
+async def _load_chunk(kind: str, plan: SeedPlan, start: int, stop: int) -> int:
+    if kind == 'authors':
+        table, columns, rows = Author.__tablename__, AUTHOR_COLUMNS, list(author_rows(plan, start, stop))
+    else:
+        table, columns, rows = Post.__tablename__, POST_COLUMNS, list(post_rows(plan, start, stop))
+
+    session_maker = new_session_maker(settings().psql_settings)
+    try:
+        async with session_maker() as session:
+            await copy_records(session, table, columns, rows)
+            await session.commit()
+    finally:
+        await session_maker.kw['bind'].dispose()
+    return len(rows)
+
+
+def load_chunk(kind: str, plan: SeedPlan, start: int, stop: int) -> int:
+    """Точка входа процесса: генерирует и загружает один кусок строк."""
+    return asyncio.run(_load_chunk(kind, plan, start, stop))
+
+
+def _secondary_indexes() -> list[Index]:
+    return [index for model in (Author, Post) for index in model.__table__.indexes]
+
+
+async def _run_ddl(session_maker: async_sessionmaker[AsyncSession], statements: list) -> None:
+    async with session_maker() as session:
+        for statement in statements:
+            await session.execute(statement)
+        await session.commit()
+
+
+async def load(plan: SeedPlan, session_maker: async_sessionmaker[AsyncSession], workers: int) -> None:
+    """Загружает plan в пустые таблицы и приводит базу в рабочее состояние."""
+    indexes = _secondary_indexes()
+    await _run_ddl(session_maker, [DropIndex(index, if_exists=True) for index in indexes])
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Авторы загружаются полностью до постов: на posts.author_id есть внешний ключ.
+        for kind, total in (('authors', plan.authors), ('posts', plan.posts)):
+            started = time.perf_counter()
+            loaded = 0
+            tasks = [loop.run_in_executor(pool, load_chunk, kind, plan, start, stop) for start, stop in _chunks(total)]
+            for task in asyncio.as_completed(tasks):
+                loaded += await task
+                print('%s: %d/%d, %.0f rows/s' % (
+                    kind, loaded, total, loaded / (time.perf_counter() - started),
+                ), end='\r', flush=True)
+            print()
+
+    started = time.perf_counter()
+    await _run_ddl(session_maker, [CreateIndex(index) for index in indexes])
+    print('indexes: %.1f s' % (time.perf_counter() - started))
+
+    async with session_maker() as session:
+        await rebuild_counters(session)
+        await session.commit()
+    await _run_ddl(session_maker, [text('ANALYZE authors'), text('ANALYZE posts')])
+
+
+async def _count(session: AsyncSession, model) -> int:
+    return (await session.execute(select(func.count()).select_from(model))).scalar()
+
+
+async def seed_database(
+        session_maker: async_sessionmaker[AsyncSession],
+        posts: int,
+        authors: int,
+        seed: int = 1,
+        reseed: bool = False,
+        workers: int | None = None,
+        **options,
+) -> None:
+    """Заполняет базу, если в ней ещё нет нужного объёма; reseed очищает таблицы заранее."""
+    async with session_maker() as session:
+        if not reseed and await _count(session, Post) >= posts and await _count(session, Author) >= authors:
+            return
+
+    await _run_ddl(session_maker, [text('TRUNCATE posts, authors, counters, post_views, posts_archive')])
+    await load(SeedPlan(posts=posts, authors=authors, seed=seed, **options), session_maker, workers or os.cpu_count())
+
+
+async def main(args: argparse.Namespace) -> None:
+    session_maker = new_session_maker(settings().psql_settings)
+    try:
+        await seed_database(
+            session_maker,
+            posts=args.posts,
+            authors=args.authors,
+            seed=args.seed,
+            reseed=args.reseed,
+            workers=args.workers,
+            zipf=args.zipf,
+            published=args.published,
+            deleted=args.deleted,
+            days=args.days,
+            text_words=args.text_words,
+        )
+    finally:
+        await session_maker.kw['bind'].dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--authors', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--reseed', action='store_true')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--zipf', type=float, default=1.1, help='показатель распределения постов по авторам')
+    parser.add_argument('--published', type=float, default=0.7, help='доля опубликованных постов')
+    parser.add_argument('--deleted', type=float, default=0.05, help='доля удалённых постов')
+    parser.add_argument('--days', type=int, default=730, help='за сколько дней распределены даты постов')
+    parser.add_argument('--text-words', type=int, default=120, help='медиана длины текста в словах')
+    asyncio.run(main(parser.parse_args()))
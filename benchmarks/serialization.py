@@ -0,0 +1,97 @@
+"""Память страницы сущностей и скорость их кодирования в JSON.
+
+Страница из --rows постов FullPostInfo строится дважды: из слотового класса
+сущности и из такого же класса без слотов (как было до перехода), объём
+считается через tracemalloc. Затем одна страница кодируется в JSON:
+прежним способом (dataclasses.asdict и json.dumps), через to_json на
+стандартном json и через to_json на orjson, если он установлен.
+
+Запуск: python -m benchmarks.serialization --rows 10000 --runs 20
+"""
+import argparse
+import dataclasses
+import json
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.common import summarize
+from src.entities.post import FullPostInfo
+from src.infrastructure import serialization
+
+PlainPostInfo = dataclasses.make_dataclass(
+    'PlainPostInfo', [(field.name, field.type) for field in dataclasses.fields(FullPostInfo)], frozen=True,
+)
+
+
+def build_page(cls: type, rows: int) -> list:
+    created_at = datetime(2024, 1, 1)
+    author_id = f"{uuid.uuid4()}"
+    return [
+        cls(
+            uuid=f"{uuid.uuid4()}",
+            title='Заголовок поста %d' % number,
+            text='Текст поста про python и postgres ' * 8,
+            is_published=True,
+            is_deleted=False,
+            created_at=created_at + timedelta(minutes=number),
+            author_id=author_id,
+        )
+        for number in range(rows)
+    ]
+
+
+def page_memory(cls: type, rows: int) -> int:
+    tracemalloc.start()
+    try:
+        page = build_page(cls, rows)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del page
+    return size
+
+
+def legacy_dumps(page: list) -> bytes:
+    return json.dumps(
+        [dataclasses.asdict(post) for post in page], ensure_ascii=False, default=str,
+    ).encode()
+
+
+def stdlib_dumps(page: list) -> bytes:
+    orjson, serialization.orjson = serialization.orjson, None
+    try:
+        return serialization.to_json(page)
+    finally:
+        serialization.orjson = orjson
+
+
+def main(rows: int, runs: int) -> None:
+    for cls in (PlainPostInfo, FullPostInfo):
+        size = page_memory(cls, rows)
+        print('%-16s %8.1f KiB/page  %6.0f B/row' % (cls.__name__, size / 1024, size / rows))
+
+    page = build_page(FullPostInfo, rows)
+    encoders = {'asdict+json': legacy_dumps, 'to_json stdlib': stdlib_dumps}
+    if serialization.orjson is not None:
+        encoders['to_json orjson'] = serialization.to_json
+
+    for name, encode in encoders.items():
+        samples = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            payload = encode(page)
+            samples.append(time.perf_counter() - started)
+        timing = summarize(samples)
+        print('%-16s p50 %7.2f ms  %9.0f rows/s  %6.1f MiB/s' % (
+            name, timing.p50 * 1000, rows / timing.p50, len(payload) / timing.p50 / 2 ** 20,
+        ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+    main(args.rows, args.runs)
@@ -0,0 +1,308 @@
+"""Набор микробенчмарков всех методов PostRepository и AuthorRepository.
+
+Поднимает Postgres (--database existing|docker|initdb), накатывает миграции,
+заполняет базу заданным объёмом и замеряет каждый метод: операции в
+секунду и p50/p95/p99. Каждый вызов выполняется в точке сохранения, которая
+затем откатывается, так что пишущие методы не меняют данные между
+повторами; в замер попадает только сам вызов. Методам, которым нужны
+особые данные (удаляемый автор без постов, архивный пост), они готовятся в
+той же точке сохранения до начала замера.
+
+Репозитории не бросают исключений, а логируют ошибку и возвращают None,
+поэтому вызов, вернувший None или записавший в лог ERROR, считается
+ошибкой, а не быстрым успехом: в результаты попадает {'error': ...}.
+
+Результаты пишутся в JSON (--output). С --baseline результаты сравниваются
+с сохранённым прогоном: методы, у которых p95 вырос больше чем на
+--threshold, перечисляются, и процесс завершается с кодом 1.
+
+Запуск:
+    python -m benchmarks.suite --database initdb --posts 10000 --output bench.json
+    python -m benchmarks.suite --posts 1000000 --baseline bench.json --threshold 0.2
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import sys
+import time
+import uuid
+from contextlib import aclosing, contextmanager
+from datetime import datetime, UTC
+from typing import Any
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from benchmarks.common import Timing, summarize
+from benchmarks.database import MODES, benchmark_database
+from benchmarks.seed import WORDS, seed_database
+from src.entities.author import AuthorImportInfo
+from src.entities.post import PostImportInfo
+from src.infrastructure.database import new_session_maker
+from src.infrastructure.explain import Operation, repository_operations
+from src.infrastructure.models import Author, Post, PostArchive
+from src.infrastructure.repository.author import AuthorRepository
+from src.infrastructure.repository.post import PostRepository
+
+
+async def _consume(stream: Any, limit: int) -> int:
+    rows = 0
+    async with aclosing(stream):
+        async for _ in stream:
+            rows += 1
+            if rows >= limit:
+                break
+    return rows
+
+
+class OperationFailed(Exception):
+    pass
+
+
+class _ErrorRecords(logging.Handler):
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+@contextmanager
+def _capture_errors():
+    handler = _ErrorRecords()
+    app_logger = logging.getLogger('src')
+    app_logger.addHandler(handler)
+    try:
+        yield handler.messages
+    finally:
+        app_logger.removeHandler(handler)
+
+
+def suite_operations(
+        post_id: str,
+        author_id: str,
+        author_email: str,
+        spare_author_id: str,
+        archived_post_id: str,
+        rng: random.Random,
+) -> dict[str, Operation]:
+    """Методы из проверки планов плюс записи и потоковое чтение; запросы поиска — из словаря данных.
+
+    delete_author удаляет spare_author_id, get_archived_post читает
+    archived_post_id: их создают подготовительные шаги из suite_setups.
+    """
+    word = rng.choice(WORDS)
+    operations = repository_operations(post_id, author_id)
+    operations.update({
+        'PostRepository.get_archived_post': lambda s: PostRepository(s).get_archived_post(archived_post_id),
+        'AuthorRepository.get_author_by_email': lambda s: AuthorRepository(s).get_author_by_email(author_email),
+        'AuthorRepository.delete_author': lambda s: AuthorRepository(s).delete_author(spare_author_id),
+        'AuthorRepository.create_author': lambda s: AuthorRepository(s).create_author(
+            f"{uuid.uuid4()}", word, 'bench%d@example.org' % rng.getrandbits(64), 'bench',
+        ),
+        'PostRepository.search_posts': lambda s: PostRepository(s).search_posts(word, None, 10),
+        'PostRepository.suggest_posts': lambda s: PostRepository(s).suggest_posts(word[:4], 10),
+        'AuthorRepository.suggest_authors': lambda s: AuthorRepository(s).suggest_authors(word[:4], 10),
+        'PostRepository.stream_posts': lambda s: _consume(PostRepository(s).stream_posts(), 1000),
+        'PostRepository.create_post': (
+            lambda s: PostRepository(s).create_post(f"{uuid.uuid4()}", word, word, author_id)
+        ),
+        'PostRepository.bulk_create_posts': lambda s: PostRepository(s).bulk_create_posts(
+            [PostImportInfo(title=word, text=word, author_id=author_id) for _ in range(100)]
+        ),
+        'AuthorRepository.bulk_create_authors': lambda s: AuthorRepository(s).bulk_create_authors(
+            [AuthorImportInfo(name=word, email='bench%d@example.org' % rng.getrandbits(64)) for _ in range(100)]
+        ),
+    })
+    return dict(sorted(operations.items()))
+
+
+def suite_setups(
+        post_id: str,
+        author_id: str,
+        spare_author_id: str,
+        archived_post_id: str,
+) -> dict[str, Operation]:
+    """Подготовка данных, которые метод расходует или которых нет в заполненной базе."""
+    async def create_spare_author(session: AsyncSession) -> None:
+        await session.execute(insert(Author).values(
+            uuid=spare_author_id, name='bench', email='%s@example.org' % spare_author_id,
+        ))
+
+    async def archive_post(session: AsyncSession) -> None:
+        now = datetime.now(UTC).replace(tzinfo=None)
+        await session.execute(insert(PostArchive).values(
+            uuid=archived_post_id, title='bench', text='bench', is_published=True,
+            created_at=now, deleted_at=now, author_id=author_id, views=0,
+        ))
+
+    return {
+        'AuthorRepository.delete_author': create_spare_author,
+        'PostRepository.get_archived_post': archive_post,
+        'PostRepository.restore_post': lambda s: PostRepository(s).delete_post(post_id, author_id),
+    }
+
+
+async def _sample_ids(session: AsyncSession, rng: random.Random) -> tuple[str, str, str]:
+    rows = (await session.execute(
+        select(Post.uuid, Post.author_id, Author.email)
+        .join(Author, Author.uuid == Post.author_id)
+        .where(Post.is_published == True, Post.is_deleted == False)
+        .limit(1000)
+    )).all()
+    if not rows:
+        raise SystemExit('База пуста: заполните её через --posts или benchmarks.seed')
+    row = rng.choice(rows)
+    return f"{row.uuid}", f"{row.author_id}", row.email
+
+
+async def run_operation(
+        session: AsyncSession,
+        operation: Operation,
+        runs: int,
+        warmup: int,
+        setup: Operation | None = None,
+) -> Timing:
+    """Замеряет operation; OperationFailed, если вызов вернул None или записал в лог ERROR."""
+    samples = []
+    for number in range(warmup + runs):
+        savepoint = await session.begin_nested()
+        try:
+            with _capture_errors() as errors:
+                if setup is not None:
+                    await setup(session)
+                    if errors:
+                        raise OperationFailed('подготовка: %s' % errors[0])
+                started = time.perf_counter()
+                result = await operation(session)
+                elapsed = time.perf_counter() - started
+        finally:
+            await savepoint.rollback()
+        if errors:
+            raise OperationFailed(errors[0])
+        if result is None:
+            raise OperationFailed('метод вернул None')
+        if number >= warmup:
+            samples.append(elapsed)
+    return summarize(samples)
+
+
+async def run_suite(
+        session_maker: async_sessionmaker[AsyncSession],
+        runs: int,
+        warmup: int,
+        seed: int,
+        only: str | None = None,
+) -> dict[str, dict[str, float]]:
+    rng = random.Random(seed)
+    results = {}
+
+    async with session_maker() as session:
+        post_id, author_id, author_email = await _sample_ids(session, rng)
+        spare_author_id, archived_post_id = f"{uuid.uuid4()}", f"{uuid.uuid4()}"
+        operations = suite_operations(post_id, author_id, author_email, spare_author_id, archived_post_id, rng)
+        setups = suite_setups(post_id, author_id, spare_author_id, archived_post_id)
+        for name, operation in operations.items():
+            if only and only not in name:
+                continue
+            try:
+                timing = await run_operation(session, operation, runs, warmup, setups.get(name))
+            except Exception as e:
+                print('%-48s ошибка: %s' % (name, e), file=sys.stderr)
+                results[name] = {'error': str(e)}
+                continue
+            results[name] = {
+                'runs': timing.runs,
+                'ops_per_s': round(timing.per_second, 1),
+                'p50_ms': round(timing.p50 * 1000, 3),
+                'p95_ms': round(timing.p95 * 1000, 3),
+                'p99_ms': round(timing.p99 * 1000, 3),
+            }
+            print('%-48s %9.1f ops/s  p50 %8.3f  p95 %8.3f  p99 %8.3f ms' % (
+                name, timing.per_second, timing.p50 * 1000, timing.p95 * 1000, timing.p99 * 1000,
+            ), file=sys.stderr)
+        await session.rollback()
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Методы, у которых p95 вырос относительно baseline больше чем на threshold."""
+    regressions = []
+    for name, current in results['results'].items():
+        previous = baseline['results'].get(name)
+        if 'error' in current:
+            if previous is not None and 'error' not in previous:
+                regressions.append('%s: %s' % (name, current['error']))
+            continue
+        if previous is None or not previous.get('p95_ms'):
+            continue
+        change = current['p95_ms'] / previous['p95_ms'] - 1
+        if change > threshold:
+            regressions.append('%s: p95 %.3f -> %.3f ms (+%.0f%%)' % (
+                name, previous['p95_ms'], current['p95_ms'], change * 100,
+            ))
+    return regressions
+
+
+def main(args: argparse.Namespace) -> int:
+    with benchmark_database(args.database, args.port) as psql_settings:
+        async def run() -> dict:
+            session_maker = new_session_maker(psql_settings)
+            try:
+                if args.posts:
+                    await seed_database(session_maker, args.posts, args.authors, args.seed, args.reseed)
+                return await run_suite(session_maker, args.runs, args.warmup, args.seed, args.only)
+            finally:
+                await session_maker.kw['bind'].dispose()
+
+        results = asyncio.run(run())
+
+    report = {
+        'meta': {
+            'created_at': datetime.now(UTC).isoformat(timespec='seconds'),
+            'database': args.database,
+            'posts': args.posts,
+            'authors': args.authors,
+            'seed': args.seed,
+            'runs': args.runs,
+            'python': platform.python_version(),
+        },
+        'results': results,
+    }
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions = compare(report, json.load(file), args.threshold)
+        for regression in regressions:
+            print('REGRESSION %s' % regression, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--database', choices=MODES, default='existing')
+    parser.add_argument('--port', type=int, default=15440, help='порт временного кластера initdb')
+    parser.add_argument('--posts', type=int, default=10000, help='0 — не заполнять базу')
+    parser.add_argument('--authors', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--reseed', action='store_true')
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--only', help='запускать только методы, содержащие подстроку')
+    parser.add_argument('--output')
+    parser.add_argument('--baseline')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    sys.exit(main(parser.parse_args()))
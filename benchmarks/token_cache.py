@@ -0,0 +1,50 @@
+"""Накладные расходы проверки токена доступа на один запрос.
+
+Сравнивает полную проверку подписи и claims через jwt.decode с попаданием
+в TokenCache, как это делает AuthService.decode_token.
+
+Запуск: python -m benchmarks.token_cache --runs 20000 --algorithm HS256
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+import jwt
+
+from benchmarks.common import format_timing, measure
+from src.application.services.token_cache import TokenCache
+
+
+async def main(runs: int, algorithm: str) -> None:
+    secret = 'benchmark-secret-key-with-enough-length'
+    payload = {
+        'exp': datetime.utcnow() + timedelta(minutes=30),
+        'iat': datetime.utcnow(),
+        'scope': 'access_token',
+        'sub': 'author@example.com',
+    }
+    token = jwt.encode(payload, secret, algorithm=algorithm)
+    cache = TokenCache()
+
+    async def decode():
+        decoded = jwt.decode(token, secret, algorithms=[algorithm])
+        return decoded['sub'] if decoded['scope'] == 'access_token' else None
+
+    async def decode_cached():
+        subject = cache.get(token)
+        if subject is None:
+            decoded = jwt.decode(token, secret, algorithms=[algorithm])
+            cache.set(token, decoded['sub'], decoded['exp'], decoded['iat'])
+            subject = decoded['sub']
+        return subject
+
+    print(format_timing('jwt.decode', await measure(decode, runs)))
+    print(format_timing('TokenCache hit', await measure(decode_cached, runs)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=20000)
+    parser.add_argument('--algorithm', default='HS256')
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.algorithm))
@@ -8,3 +8,11 @@ class NotFoundInfoException(RepositoryError):
 
 class NotPerformedActionException(RepositoryError):
     pass
+
+
+class InvalidCursorException(RepositoryError):
+    pass
+
+
+class StreamInterruptedException(RepositoryError):
+    pass
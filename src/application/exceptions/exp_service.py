@@ -28,3 +28,11 @@ class ExpiredAccessToken(ServiceError):
 
 class ExpiredRefreshToken(ServiceError):
     pass
+
+
+class HashingOverloaded(ServiceError):
+    pass
+
+
+class RevokedAccessToken(ServiceError):
+    pass
@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Iterable, Protocol
 
 
 class IAuthorRepository(Protocol):
@@ -7,15 +7,30 @@ class IAuthorRepository(Protocol):
     async def get_author_by_id(self, author_id: str):
         pass
 
+    async def get_authors_by_ids(self, author_ids: Iterable[str]):
+        pass
+
+    async def count_authors(self, mode):
+        pass
+
+    async def suggest_authors(self, prefix: str, limit: int):
+        pass
+
     async def get_author_by_email(self, email: str):
         pass
 
     async def get_author_list_by_limit(self, skip: int, limit: int):
         pass
 
+    async def get_author_list_by_cursor(self, cursor: str | None, limit: int, count):
+        pass
+
     async def create_author(self, author_id: str, name: str, email: str, hashed_password: str):
         pass
 
+    async def bulk_create_authors(self, authors, chunk_size: int, on_progress):
+        pass
+
     async def delete_author(self, author_id: str):
         pass
 
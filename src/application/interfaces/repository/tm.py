@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Any, AsyncContextManager, Callable, Protocol
 
 
 class ITransactionManager(Protocol):
@@ -9,3 +9,9 @@ class ITransactionManager(Protocol):
 
     async def rollback(self) -> None:
         pass
+
+    def after_commit(self, callback: Callable[[], Any]) -> None:
+        pass
+
+    def unit_of_work(self) -> AsyncContextManager[Any]:
+        pass
@@ -9,12 +9,24 @@ class IAuthService(Protocol):
     def verify_password(self, password: str, encoded_password: str):
         pass
 
+    async def encode_password_async(self, password: str):
+        pass
+
+    async def verify_password_async(self, password: str, encoded_password: str):
+        pass
+
     def encode_token(self, username: str):
         pass
 
     def decode_token(self, token: str):
         pass
 
+    def logout(self, token: str):
+        pass
+
+    def revoke_tokens(self, username: str):
+        pass
+
     def encode_refresh_token(self, username: str):
         pass
 
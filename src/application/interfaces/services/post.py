@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Iterable, Protocol
 
 
 class IPostService(Protocol):
@@ -7,17 +7,56 @@ class IPostService(Protocol):
     async def get_post_by_id(self, post_id: str):
         pass
 
+    async def get_posts_by_ids(self, post_ids: Iterable[str]):
+        pass
+
     async def get_post_list_by_limit(self, skip: int, limit: int):
         pass
 
     async def get_posts_by_author(self, author_id: str, skip: int, limit: int):
         pass
 
+    async def get_post_list_by_cursor(self, cursor: str | None, limit: int, count):
+        pass
+
+    async def get_post_summaries(self, cursor: str | None, limit: int, excerpt_length: int, count):
+        pass
+
+    async def search_posts(self, search_query: str, cursor: str | None, limit: int):
+        pass
+
+    async def suggest_posts(self, prefix: str, limit: int):
+        pass
+
+    async def get_most_viewed_posts(self, limit: int):
+        pass
+
+    async def get_posts_by_author_by_cursor(self, author_id: str, cursor: str | None, limit: int, count):
+        pass
+
+    def export_posts(self, filters, batch_size: int):
+        pass
+
+    async def count_published_posts(self):
+        pass
+
+    async def count_posts_by_author(self, author_id: str):
+        pass
+
     async def create_post(self, title: str, text: str, user_id: str):
         pass
 
+    async def bulk_create_posts(self, posts, chunk_size: int, on_progress):
+        pass
+
     async def delete_post(self, post_id: str, author_id: str):
         pass
 
+    async def get_archived_post(self, post_id: str):
+        pass
+
+    async def restore_post(self, post_id: str, author_id: str):
+        pass
+
     async def update_post(self, post_id: str, author_id: str, text: str):
         pass
\ No newline at end of file
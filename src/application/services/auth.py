@@ -1,53 +1,117 @@
-import jwt
 import logging
-from passlib.context import CryptContext
-from datetime import datetime, timedelta
-from application.exceptions.exp_service import (
+import time
+from datetime import timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from src.application.exceptions.exp_service import (
     InvalidAccessToken,
     ExpiredAccessToken,
     InvalidRefreshToken,
     InvalidScopeToken,
     ExpiredRefreshToken,
+    RevokedAccessToken,
 )
-from application.interfaces.services.auth import IAuthService
+from src.application.interfaces.services.auth import IAuthService
+from src.application.services.hashing import HashingPool
+from src.application.services.token_cache import TokenCache
+from src.metrics import registry, timed
 
-from src.config import settings
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
 
 logger = logging.getLogger(__name__)
 
+ACCESS_TOKEN_TTL = timedelta(minutes=30)
+REFRESH_TOKEN_TTL = timedelta(hours=10)
+
+
+# passlib, jwt и настройки загружаются при первом обращении, а не при импорте
+# модуля: процессы, которым аутентификация не нужна, их не импортируют.
+
+@lru_cache
+def _auth_settings():
+    from src.config import settings
+    return settings().auth_settings
+
+
+@lru_cache
+def _hasher() -> 'CryptContext':
+    from passlib.context import CryptContext
+    return CryptContext(schemes=['bcrypt'], bcrypt__rounds=_auth_settings().BCRYPT_ROUNDS)
+
+
+@lru_cache
+def _hashing_pool() -> HashingPool:
+    pool = HashingPool(_auth_settings().HASHING_WORKERS, _auth_settings().HASHING_QUEUE_LIMIT)
+    registry.gauge('bcrypt_queue_depth', 'Задачи хэширования паролей в очереди и в работе.', lambda: pool.depth)
+    return pool
 
+
+@lru_cache
+def _token_cache() -> TokenCache:
+    # Отзыв по subject хранится, пока живы выпущенные до него токены обновления.
+    return TokenCache(_auth_settings().TOKEN_CACHE_SIZE, REFRESH_TOKEN_TTL.total_seconds())
+
+
+@timed
 class AuthService(IAuthService):
     """Сервис для работы с аутентификацией и авторизацией."""
 
-    hasher = CryptContext(schemes=['bcrypt'])
-    secret = settings().SECRET_KEY
-    algoritm = settings().ALGORITHM
+    @property
+    def hasher(self) -> 'CryptContext':
+        return _hasher()
+
+    @property
+    def hashing_pool(self) -> HashingPool:
+        return _hashing_pool()
+
+    @property
+    def token_cache(self) -> TokenCache:
+        return _token_cache()
+
+    @property
+    def secret(self) -> str:
+        return _auth_settings().SECRET_KEY
+
+    @property
+    def algoritm(self) -> str:
+        return _auth_settings().ALGORITHM
 
     def encode_password(self, password: str) -> str:
-        logger.info(
-            'msg details: успешное завершение [%s]\n'
-            'service func: %s.' % (datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-                                  self.encode_password.__name__))
+        logger.info('msg details: успешное завершение\nservice func: %s.', self.encode_password.__name__)
         return self.hasher.hash(password)
 
     def verify_password(self, password: str, encoded_password: str) -> bool:
-        logger.info(
-            'msg details: успешное завершение [%s]\n'
-            'service func: %s.' % (datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-                                  self.verify_password.__name__))
+        logger.info('msg details: успешное завершение\nservice func: %s.', self.verify_password.__name__)
         return self.hasher.verify(password, encoded_password)
 
+    async def encode_password_async(self, password: str) -> str:
+        """Хэширует пароль в пуле потоков, не блокируя цикл событий."""
+        return await self.hashing_pool.run(self.hasher.hash, password)
+
+    async def verify_password_async(self, password: str, encoded_password: str) -> tuple[bool, str | None]:
+        """Проверяет пароль в пуле потоков.
+
+        Вторым элементом возвращает новый хэш, если сохранённый создан с
+        устаревшей стоимостью bcrypt; его нужно записать через
+        AuthorService.rehash_password, который не отзывает токены.
+        """
+        return await self.hashing_pool.run(self.hasher.verify_and_update, password, encoded_password)
+
     def encode_token(self, username: str) -> str:
+        import jwt
+
+        # iat с долями секунды: токен, выпущенный сразу после отзыва, не
+        # попадает под него, даже если получен в ту же секунду.
+        issued_at = time.time()
         payload = {
-            'exp': datetime.utcnow() + timedelta(days=0, minutes=30),
-            'iat': datetime.utcnow(),
+            'exp': issued_at + ACCESS_TOKEN_TTL.total_seconds(),
+            'iat': issued_at,
             'scope': 'access_token',
             'sub': username
         }
-        logger.info(
-            'msg details: успешное завершение [%s]\n'
-            'service func: %s.' % (datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-                                  self.encode_token.__name__))
+        logger.info('msg details: успешное завершение\nservice func: %s.', self.encode_token.__name__)
         return jwt.encode(
             payload,
             self.secret,
@@ -55,41 +119,67 @@ class AuthService(IAuthService):
         )
 
     def decode_token(self, token: str) -> str:
+        import jwt
+
+        subject = self.token_cache.get(token)
+        if subject is not None:
+            return subject
+
         try:
             payload = jwt.decode(token, self.secret, algorithms=[self.algoritm])
             if (payload['scope'] == 'access_token'):
-                logger.info(
-                    'msg details: успешное завершение [%s]\n'
-                    'service func: %s.' % (datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-                                          self.decode_token.__name__))
+                if self.token_cache.is_revoked(token, payload['sub'], payload['iat']):
+                    raise RevokedAccessToken("Токен доступа отозван")
+                self.token_cache.set(token, payload['sub'], payload['exp'], payload['iat'])
+                logger.info('msg details: успешное завершение\nservice func: %s.', self.decode_token.__name__)
                 return payload['sub']
             raise InvalidScopeToken("Неверная область действия токена")
         except jwt.ExpiredSignatureError as e:
             logger.error(
-                'msg details: %s [%s]\n'
-                'service func: %s.\nОшибка: Истек срок действия токена доступа' %
-                (e, datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-                 self.refresh_token.__name__))
+                'msg details: %s\nservice func: %s.\nОшибка: Истек срок действия токена доступа',
+                e, self.decode_token.__name__)
             raise ExpiredAccessToken("Истек срок действия токена доступа")
         except jwt.InvalidTokenError as e:
             logger.error(
-                'msg details: %s [%s]\n'
-                'service func: %s.\nОшибка: Неверный токен доступа' %
-                (e, datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-                 self.refresh_token.__name__))
+                'msg details: %s\nservice func: %s.\nОшибка: Неверный токен доступа',
+                e, self.decode_token.__name__)
+            raise InvalidAccessToken("Неверный токен доступа")
+
+    def logout(self, token: str) -> None:
+        """Отзывает токен доступа; следующие запросы с ним отклоняются."""
+        import jwt
+
+        try:
+            payload = jwt.decode(token, self.secret, algorithms=[self.algoritm])
+        except jwt.ExpiredSignatureError:
+            return
+        except jwt.InvalidTokenError as e:
+            logger.error("Ошибка при выходе: неверный токен доступа: %s", e)
             raise InvalidAccessToken("Неверный токен доступа")
 
+        self.token_cache.revoke_token(token, payload['exp'])
+
+    def revoke_tokens(self, username: str) -> None:
+        """Отзывает все выпущенные пользователю токены доступа и обновления; username — email автора.
+
+        Отзыв хранится в памяти процесса (TokenCache): другие воркеры о нём
+        не знают и принимают токены до их exp.
+        """
+        self.token_cache.revoke_subject(username)
+
     def encode_refresh_token(self, username: str) -> str:
+        import jwt
+
+        # iat с долями секунды: токен, выпущенный сразу после отзыва, не
+        # попадает под него, даже если получен в ту же секунду.
+        issued_at = time.time()
         payload = {
-            'exp': datetime.utcnow() + timedelta(days=0, hours=10),
-            'iat': datetime.utcnow(),
+            'exp': issued_at + REFRESH_TOKEN_TTL.total_seconds(),
+            'iat': issued_at,
             'scope': 'refresh_token',
             'sub': username
         }
-        logger.info(
-            'msg details: успешное завершение [%s]\n'
-            'service func: %s.' % (datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-                                  self.encode_refresh_token.__name__))
+        logger.info('msg details: успешное завершение\nservice func: %s.', self.encode_refresh_token.__name__)
         return jwt.encode(
             payload,
             self.secret,
@@ -97,28 +187,25 @@ class AuthService(IAuthService):
         )
 
     def refresh_token(self, refresh_token: str) -> str:
+        import jwt
+
         try:
             payload = jwt.decode(refresh_token, self.secret, algorithms=[self.algoritm])
             if (payload['scope'] == 'refresh_token'):
                 username = payload['sub']
+                if self.token_cache.is_revoked(refresh_token, username, payload['iat']):
+                    raise InvalidRefreshToken("Токен обновления отозван")
                 new_token = self.encode_token(username)
-                logger.info(
-                    'msg details: успешное завершение [%s]\n'
-                    'service func: %s.' % (datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-                                          self.refresh_token.__name__))
+                logger.info('msg details: успешное завершение\nservice func: %s.', self.refresh_token.__name__)
                 return new_token
             raise InvalidScopeToken("Неверная область действия токена")
         except jwt.ExpiredSignatureError as e:
             logger.error(
-                'msg details: %s [%s]\n'
-                'service func: %s.\nОшибка: Истек срок действия токена обновления' %
-                (e, datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-                 self.refresh_token.__name__))
+                'msg details: %s\nservice func: %s.\nОшибка: Истек срок действия токена обновления',
+                e, self.refresh_token.__name__)
             raise ExpiredRefreshToken("Истек срок действия токена обновления")
         except jwt.InvalidTokenError as e:
             logger.error(
-                'msg details: %s [%s]\n'
-                'service func: %s.\nОшибка: Неверный токен обновления' %
-                (e, datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-                 self.refresh_token.__name__))
+                'msg details: %s\nservice func: %s.\nОшибка: Неверный токен обновления',
+                e, self.refresh_token.__name__)
             raise InvalidRefreshToken("Неверный токен обновления")
@@ -1,22 +1,34 @@
 import uuid
 import logging
+from typing import Any, AsyncIterable, Callable, Iterable
 
-from src.entities.author import FullAuthorInfo, AuthorInfo
-from src.entities.outcome import OutcomeMsgInfo
+from src.entities.author import FullAuthorInfo, AuthorInfo, AuthorImportInfo, AuthorSuggestionInfo
+from src.entities.outcome import OutcomeMsgInfo, BulkImportInfo
+from src.entities.page import CursorPage, CountMode
 from src.application.interfaces.repository.author import IAuthorRepository
 from src.application.interfaces.repository.tm import ITransactionManager
 from src.application.interfaces.services.author import IAuthorService
+from src.application.interfaces.services.auth import IAuthService
 from src.application.exceptions.exp_service import AuthorServiceError
+from src.application.services.typeahead import normalize_prefix
+from src.metrics import timed
 
 logger = logging.getLogger(__name__)
 
 
+@timed
 class AuthorService(IAuthorService):
     """Сервис для работы с постами."""
 
-    def __init__(self, author_repository: IAuthorRepository, tm: ITransactionManager):
+    def __init__(
+            self,
+            author_repository: IAuthorRepository,
+            tm: ITransactionManager,
+            auth_service: IAuthService | None = None,
+    ):
         self.author_repo = author_repository
         self.tm = tm
+        self.auth_service = auth_service
 
     async def get_author_by_id(self, author_id: str) -> FullAuthorInfo | None:
         try:
@@ -25,6 +37,31 @@ class AuthorService(IAuthorService):
         except AuthorServiceError as e:
             logger.error("Ошибка при получении автора по id: %s", e)
 
+    async def get_authors_by_ids(self, author_ids: Iterable[str]) -> list[FullAuthorInfo] | None:
+        try:
+            result = await self.author_repo.get_authors_by_ids(author_ids=author_ids)
+            return result
+        except AuthorServiceError as e:
+            logger.error("Ошибка при получении авторов по списку id: %s", e)
+
+    async def count_authors(self, mode: CountMode = CountMode.exact) -> int | None:
+        try:
+            result = await self.author_repo.count_authors(mode=mode)
+            return result
+        except AuthorServiceError as e:
+            logger.error("Ошибка при получении числа авторов: %s", e)
+
+    async def suggest_authors(self, prefix: str, limit: int = 10) -> list[AuthorSuggestionInfo] | None:
+        prefix = normalize_prefix(prefix)
+        if not prefix:
+            return []
+
+        try:
+            result = await self.author_repo.suggest_authors(prefix=prefix, limit=limit)
+            return result
+        except AuthorServiceError as e:
+            logger.error("Ошибка при подборе подсказок по авторам: %s", e)
+
     async def get_author_by_email(self, email: str) -> FullAuthorInfo | None:
         try:
             result = await self.author_repo.get_author_by_email(email=email)
@@ -39,6 +76,18 @@ class AuthorService(IAuthorService):
         except AuthorServiceError as e:
             logger.error("Ошибка при получении всех авторов: %s", e)
 
+    async def get_author_list_by_cursor(
+            self,
+            cursor: str | None,
+            limit: int,
+            count: CountMode | None = None,
+    ) -> CursorPage[AuthorInfo] | None:
+        try:
+            result = await self.author_repo.get_author_list_by_cursor(cursor=cursor, limit=limit, count=count)
+            return result
+        except AuthorServiceError as e:
+            logger.error("Ошибка при получении авторов по курсору: %s", e)
+
     async def create_author(self, name: str, email: str, hashed_password: str) -> FullAuthorInfo | None:
         try:
             new_user_id = uuid.uuid4().hex
@@ -53,6 +102,27 @@ class AuthorService(IAuthorService):
             await self.tm.rollback()
             logger.error("Ошибка при создании автора: %s", e)
 
+    async def bulk_create_authors(
+            self,
+            authors: Iterable[AuthorImportInfo] | AsyncIterable[AuthorImportInfo],
+            chunk_size: int = 5000,
+            on_progress: Callable[[BulkImportInfo], Any] | None = None,
+    ) -> BulkImportInfo | None:
+        try:
+            result = await self.author_repo.bulk_create_authors(
+                authors=authors,
+                chunk_size=chunk_size,
+                on_progress=on_progress,
+            )
+            if result is None:
+                await self.tm.rollback()
+                return None
+            await self.tm.commit()
+            return result
+        except AuthorServiceError as e:
+            await self.tm.rollback()
+            logger.error("Ошибка при массовой загрузке авторов: %s", e)
+
     async def delete_author(self, author_id: str) -> OutcomeMsgInfo | None:
         try:
             result = await self.author_repo.delete_author(author_id=author_id)
@@ -64,11 +134,30 @@ class AuthorService(IAuthorService):
 
     async def change_password(self, author_id: str, hashed_password: str) -> OutcomeMsgInfo | None:
         try:
+            author = await self.author_repo.get_author_by_id(author_id=author_id)
             result = await self.author_repo.change_password(author_id=author_id, hashed_password=hashed_password)
+            if result is not None and author is not None and self.auth_service is not None:
+                # Токены выпускаются на email автора (sub); старые отзываются
+                # только после фиксации нового пароля.
+                self.tm.after_commit(lambda: self.auth_service.revoke_tokens(author.email))
             await self.tm.commit()
             return result
         except AuthorServiceError as e:
              await self.tm.rollback()
              logger.error("Ошибка при изменении пароля автора: %s", e)
 
+    async def rehash_password(self, author_id: str, hashed_password: str) -> OutcomeMsgInfo | None:
+        """Сохраняет хэш того же пароля с новой стоимостью bcrypt.
+
+        Пароль не менялся, поэтому, в отличие от change_password, выпущенные
+        токены не отзываются.
+        """
+        try:
+            result = await self.author_repo.change_password(author_id=author_id, hashed_password=hashed_password)
+            await self.tm.commit()
+            return result
+        except AuthorServiceError as e:
+             await self.tm.rollback()
+             logger.error("Ошибка при обновлении хэша пароля автора: %s", e)
+
 
@@ -0,0 +1,36 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from src.application.exceptions.exp_service import HashingOverloaded
+
+T = TypeVar('T')
+
+
+class HashingPool:
+    """Ограниченный пул потоков для bcrypt.
+
+    bcrypt отпускает GIL на время хэширования, поэтому потоки действительно
+    работают параллельно и не останавливают цикл событий. Если в очереди уже
+    queue_limit задач, новая сразу отклоняется HashingOverloaded, а не копит
+    ожидание: при всплеске логинов клиенты получают быстрый отказ.
+    """
+
+    def __init__(self, workers: int = 4, queue_limit: int = 64):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.depth = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self.depth >= self.queue_limit:
+            raise HashingOverloaded("Очередь хэширования паролей переполнена")
+
+        self.depth += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.depth -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,17 +1,32 @@
 import uuid
 import logging
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable
 
 
-from src.entities.post import FullPostInfo, PostInfo
-from src.entities.outcome import OutcomeMsgInfo
+from src.entities.post import (
+    FullPostInfo,
+    PostInfo,
+    PostInfoAuthor,
+    PostImportInfo,
+    PostFilterInfo,
+    PostSummaryInfo,
+    PostSearchInfo,
+    PostSuggestionInfo,
+    PostViewsInfo,
+)
+from src.entities.page import CursorPage, CountMode
+from src.entities.outcome import OutcomeMsgInfo, BulkImportInfo
 from src.application.interfaces.repository.post import IPostRepository
 from src.application.interfaces.repository.tm import ITransactionManager
 from src.application.interfaces.services.post import IPostService
 from src.application.exceptions.exp_service import PostServiceError
+from src.application.services.typeahead import normalize_prefix
+from src.metrics import timed
 
 logger = logging.getLogger(__name__)
 
 
+@timed
 class PostService(IPostService):
     """Сервис для работы с постами."""
 
@@ -26,6 +41,13 @@ class PostService(IPostService):
         except PostServiceError as e:
             logger.error("Ошибка при получении поста по id: %s", e)
 
+    async def get_posts_by_ids(self, post_ids: Iterable[str]) -> list[FullPostInfo] | None:
+        try:
+            result = await self.post_repo.get_posts_by_ids(post_ids=post_ids)
+            return result
+        except PostServiceError as e:
+            logger.error("Ошибка при получении постов по списку id: %s", e)
+
     async def get_post_list_by_limit(self, skip: int, limit: int):
         try:
             result = await self.post_repo.get_post_list_by_limit(skip=skip, limit=limit)
@@ -40,6 +62,109 @@ class PostService(IPostService):
         except PostServiceError as e:
             logger.error("Ошибка при получении постов автора: %s", e)
 
+    async def get_post_list_by_cursor(
+            self,
+            cursor: str | None,
+            limit: int,
+            count: CountMode | None = None,
+    ) -> CursorPage[PostInfoAuthor] | None:
+        try:
+            result = await self.post_repo.get_post_list_by_cursor(cursor=cursor, limit=limit, count=count)
+            return result
+        except PostServiceError as e:
+            logger.error("Ошибка при получении постов по курсору: %s", e)
+
+    async def get_post_summaries(
+            self,
+            cursor: str | None,
+            limit: int,
+            excerpt_length: int = 200,
+            count: CountMode | None = None,
+    ) -> CursorPage[PostSummaryInfo] | None:
+        try:
+            result = await self.post_repo.get_post_summaries(
+                cursor=cursor,
+                limit=limit,
+                excerpt_length=excerpt_length,
+                count=count,
+            )
+            return result
+        except PostServiceError as e:
+            logger.error("Ошибка при получении кратких описаний постов: %s", e)
+
+    async def search_posts(
+            self,
+            search_query: str,
+            cursor: str | None,
+            limit: int = 20,
+    ) -> CursorPage[PostSearchInfo] | None:
+        try:
+            result = await self.post_repo.search_posts(search_query=search_query, cursor=cursor, limit=limit)
+            return result
+        except PostServiceError as e:
+            logger.error("Ошибка при поиске постов: %s", e)
+
+    async def suggest_posts(self, prefix: str, limit: int = 10) -> list[PostSuggestionInfo] | None:
+        prefix = normalize_prefix(prefix)
+        if not prefix:
+            return []
+
+        try:
+            result = await self.post_repo.suggest_posts(prefix=prefix, limit=limit)
+            return result
+        except PostServiceError as e:
+            logger.error("Ошибка при подборе подсказок по постам: %s", e)
+
+    async def get_most_viewed_posts(self, limit: int = 10) -> list[PostViewsInfo] | None:
+        try:
+            result = await self.post_repo.get_most_viewed_posts(limit=limit)
+            return result
+        except PostServiceError as e:
+            logger.error("Ошибка при получении самых просматриваемых постов: %s", e)
+
+    async def get_posts_by_author_by_cursor(
+            self,
+            author_id: str,
+            cursor: str | None,
+            limit: int,
+            count: CountMode | None = None,
+    ) -> CursorPage[PostInfo] | None:
+        try:
+            result = await self.post_repo.get_posts_by_author_by_cursor(
+                author_id=author_id,
+                cursor=cursor,
+                limit=limit,
+                count=count,
+            )
+            return result
+        except PostServiceError as e:
+            logger.error("Ошибка при получении постов автора по курсору: %s", e)
+
+    async def export_posts(
+            self,
+            filters: PostFilterInfo | None = None,
+            batch_size: int = 1000,
+    ) -> AsyncIterator[FullPostInfo]:
+        try:
+            async for post in self.post_repo.stream_posts(filters=filters, batch_size=batch_size):
+                yield post
+        except PostServiceError as e:
+            logger.error("Ошибка при выгрузке постов: %s", e)
+
+    async def count_published_posts(self) -> int | None:
+        try:
+            result = await self.post_repo.count_published_posts()
+            return result
+        except PostServiceError as e:
+            logger.error("Ошибка при получении числа опубликованных постов: %s", e)
+
+    async def count_posts_by_author(self, author_id: str) -> int | None:
+        try:
+            result = await self.post_repo.count_posts_by_author(author_id=author_id)
+            return result
+        except PostServiceError as e:
+            logger.error("Ошибка при получении числа постов автора: %s", e)
+
     async def create_post(self, title: str, text: str, user_id: str) -> FullPostInfo | None:
         try:
             new_post_id = uuid.uuid4().hex
@@ -50,6 +175,23 @@ class PostService(IPostService):
             await self.tm.rollback()
             logger.error("Ошибка при создании поста: %s", e)
 
+    async def bulk_create_posts(
+            self,
+            posts: Iterable[PostImportInfo] | AsyncIterable[PostImportInfo],
+            chunk_size: int = 5000,
+            on_progress: Callable[[BulkImportInfo], Any] | None = None,
+    ) -> BulkImportInfo | None:
+        try:
+            result = await self.post_repo.bulk_create_posts(posts=posts, chunk_size=chunk_size, on_progress=on_progress)
+            if result is None:
+                await self.tm.rollback()
+                return None
+            await self.tm.commit()
+            return result
+        except PostServiceError as e:
+            await self.tm.rollback()
+            logger.error("Ошибка при массовой загрузке постов: %s", e)
+
     async def delete_post(self, post_id: str, author_id: str) -> PostInfo | None:
         try:
             result = await self.post_repo.delete_post(post_id=post_id, author_id=author_id)
@@ -59,6 +201,22 @@ class PostService(IPostService):
             await self.tm.rollback()
             logger.error("Ошибка при удалении поста: %s", e)
 
+    async def get_archived_post(self, post_id: str) -> FullPostInfo | None:
+        try:
+            result = await self.post_repo.get_archived_post(post_id=post_id)
+            return result
+        except PostServiceError as e:
+            logger.error("Ошибка при получении архивного поста: %s", e)
+
+    async def restore_post(self, post_id: str, author_id: str) -> FullPostInfo | None:
+        try:
+            result = await self.post_repo.restore_post(post_id=post_id, author_id=author_id)
+            await self.tm.commit()
+            return result
+        except PostServiceError as e:
+            await self.tm.rollback()
+            logger.error("Ошибка при восстановлении поста из архива: %s", e)
+
     async def update_post(self, post_id: str, author_id: str, text: str) -> OutcomeMsgInfo | None:
         try:
             result = await self.post_repo.update_post(post_id=post_id, author_id=author_id, text=text)
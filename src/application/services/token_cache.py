@@ -0,0 +1,101 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+
+class VerifiedToken(NamedTuple):
+    subject: str
+    exp: float
+    iat: float
+
+
+def token_digest(token: str) -> bytes:
+    """Ключ кэша: сам токен в памяти не хранится."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """Кэш проверенных токенов доступа и отзывов.
+
+    Токен, прошедший проверку подписи, хранится до своего exp, но не дольше,
+    чем позволяет maxsize: при переполнении вытесняется давно не
+    использованный. Отзывы проверяются при каждом попадании, поэтому выход и
+    смена пароля действуют сразу. Отзыв по subject отменяет все токены,
+    выпущенные раньше момента отзыва; время отзыва и iat сравниваются с
+    долями секунды, поэтому токен, полученный сразу после отзыва, действует.
+
+    Ограничение: кэш и отзывы живут в памяти процесса и не разделяются
+    между воркерами. Отзыв виден только процессу, который его выполнил;
+    остальные принимают токен до его exp. При нескольких воркерах отзыв
+    нужно хранить в общем хранилище.
+    """
+
+    def __init__(self, maxsize: int = 10000, max_token_ttl: float = 3600, timer: Callable[[], float] = time.time):
+        self.maxsize = maxsize
+        self.max_token_ttl = max_token_ttl
+        self._timer = timer
+        self._entries: OrderedDict[bytes, VerifiedToken] = OrderedDict()
+        self._revoked_tokens: dict[bytes, float] = {}
+        self._revoked_subjects: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> str | None:
+        """subject действующего и не отозванного токена либо None."""
+        digest = token_digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+
+        if entry.exp <= self._timer() or self._is_revoked(digest, entry.subject, entry.iat):
+            del self._entries[digest]
+            return None
+
+        self._entries.move_to_end(digest)
+        return entry.subject
+
+    def set(self, token: str, subject: str, exp: float, iat: float) -> None:
+        digest = token_digest(token)
+        if self._is_revoked(digest, subject, iat):
+            return
+
+        self._entries[digest] = VerifiedToken(subject, exp, iat)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def is_revoked(self, token: str, subject: str, iat: float) -> bool:
+        return self._is_revoked(token_digest(token), subject, iat)
+
+    def _is_revoked(self, digest: bytes, subject: str, iat: float) -> bool:
+        if digest in self._revoked_tokens:
+            return True
+        revoked_before = self._revoked_subjects.get(subject)
+        return revoked_before is not None and iat < revoked_before
+
+    def revoke_token(self, token: str, exp: float) -> None:
+        """Отзывает один токен; запись об отзыве нужна лишь до его exp."""
+        digest = token_digest(token)
+        self._entries.pop(digest, None)
+        self._revoked_tokens[digest] = exp
+        self._prune()
+
+    def revoke_subject(self, subject: str) -> None:
+        """Отзывает все уже выпущенные токены subject."""
+        self._revoked_subjects[subject] = self._timer()
+        self._prune()
+
+    def _prune(self) -> None:
+        now = self._timer()
+        self._revoked_tokens = {d: exp for d, exp in self._revoked_tokens.items() if exp > now}
+        # Токены, выпущенные до отзыва, истекают не позже чем через max_token_ttl.
+        self._revoked_subjects = {
+            s: at for s, at in self._revoked_subjects.items() if at + self.max_token_ttl > now
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._revoked_tokens.clear()
+        self._revoked_subjects.clear()
@@ -0,0 +1,6 @@
+MAX_PREFIX_LENGTH = 64
+
+
+def normalize_prefix(prefix: str) -> str:
+    """Приводит ввод к единому виду, чтобы одинаковые нажатия попадали в один ключ кэша."""
+    return ' '.join(prefix.lower().split())[:MAX_PREFIX_LENGTH]
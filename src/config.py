@@ -1,4 +1,6 @@
+from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,6 +13,10 @@ class AuthSettings(BaseModel):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    BCRYPT_ROUNDS: int = 12
+    HASHING_WORKERS: int = 4
+    HASHING_QUEUE_LIMIT: int = 64
+    TOKEN_CACHE_SIZE: int = 10000
 
 
 class PostgresSettings(BaseModel):
@@ -22,6 +28,25 @@ class PostgresSettings(BaseModel):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
 
+    POOL_SIZE: int = 5
+    POOL_MAX_OVERFLOW: int = 10
+    POOL_TIMEOUT: float = 30.0
+    POOL_RECYCLE: int = 1800
+    POOL_PRE_PING: bool = True
+    STATEMENT_CACHE_SIZE: int = 100
+    # PgBouncer в режиме pool_mode=transaction не сохраняет подготовленные
+    # выражения между транзакциями, поэтому их кэш отключается.
+    PGBOUNCER_TRANSACTION_MODE: bool = False
+
+    # Реплики для чтения в виде "host" или "host:port"; порт по умолчанию POSTGRES_PORT.
+    POSTGRES_REPLICA_HOSTS: list[str] = []
+    REPLICA_SELECTION: Literal['round_robin', 'least_busy'] = 'round_robin'
+
+    # Статистика запросов по методам репозиториев, журнал медленных запросов и поиск N+1.
+    SQL_INSTRUMENTATION: bool = False
+    SLOW_QUERY_MS: float | None = None
+    N_PLUS_ONE_THRESHOLD: int = 0
+
 
 class Settings(BaseSettings):
     psql_settings: PostgresSettings
@@ -34,4 +59,7 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()
+@lru_cache
+def settings() -> Settings:
+    """Настройки читаются из окружения и .env при первом обращении, а не при импорте."""
+    return Settings()
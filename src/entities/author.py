@@ -1,14 +1,28 @@
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FullAuthorInfo:
     uuid: str
     name: str
     email: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AuthorInfo:
     name: str
     email: str
+
+
+@dataclass(frozen=True, slots=True)
+class AuthorSuggestionInfo:
+    uuid: str
+    name: str
+    score: float
+
+
+@dataclass(frozen=True, slots=True)
+class AuthorImportInfo:
+    name: str
+    email: str
+    uuid: str | None = None
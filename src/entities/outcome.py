@@ -15,9 +15,17 @@ class EntityAct(str, Enum):
     cancel = 'cancel'
 
 
-@dataclass
+@dataclass(slots=True)
 class OutcomeMsgInfo:
     entity_id: str
     msg: str = 'completed successfully'
     entity_name: str | None = None
     entity_act: str | None = None
+
+
+@dataclass(slots=True)
+class BulkImportInfo:
+    entity_name: str
+    chunks: int = 0
+    inserted: int = 0
+    rejected: int = 0
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Generic, TypeVar
+
+T = TypeVar('T')
+
+
+class CountMode(str, Enum):
+    exact = 'exact'
+    estimate = 'estimate'
+
+
+@dataclass(frozen=True)
+class CursorPage(Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+    total: int | None = None
@@ -4,7 +4,7 @@ from datetime import datetime
 from .author import AuthorInfo
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FullPostInfo:
     uuid: str
     title: str
@@ -15,7 +15,7 @@ class FullPostInfo:
     author_id: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PostInfoAuthor:
     title: str
     text: str
@@ -24,10 +24,63 @@ class PostInfoAuthor:
     author: AuthorInfo
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PostInfo:
     title: str
     text: str
     is_published: bool
     created_at: datetime
     author_id: str
+
+
+@dataclass(frozen=True, slots=True)
+class PostSummaryInfo:
+    uuid: str
+    title: str
+    excerpt: str
+    created_at: datetime
+    author_name: str
+
+
+@dataclass(frozen=True, slots=True)
+class PostSearchInfo:
+    uuid: str
+    title: str
+    headline: str
+    rank: float
+    created_at: datetime
+    author_id: str
+
+
+@dataclass(frozen=True, slots=True)
+class PostSuggestionInfo:
+    uuid: str
+    title: str
+    score: float
+
+
+@dataclass(frozen=True, slots=True)
+class PostViewsInfo:
+    uuid: str
+    title: str
+    views: int
+
+
+@dataclass(frozen=True, slots=True)
+class PostImportInfo:
+    title: str
+    text: str
+    author_id: str
+    is_published: bool = False
+    is_deleted: bool = False
+    created_at: datetime | None = None
+    uuid: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class PostFilterInfo:
+    author_id: str | None = None
+    is_published: bool | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    include_deleted: bool = False
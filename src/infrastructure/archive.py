@@ -0,0 +1,219 @@
+"""Перенос старых удалённых постов из posts в posts_archive.
+
+Удалённые посты (is_deleted) отфильтровываются всеми чтениями, но
+остаются в posts и её индексах. PostArchiver переносит те из них, что
+удалены (deleted_at) раньше срока хранения retention, небольшими
+пакетами: каждый пакет — один запрос и одна транзакция
+
+    WITH batch AS (SELECT uuid ... FOR UPDATE SKIP LOCKED LIMIT n),
+         moved AS (DELETE FROM posts ... RETURNING ...)
+    INSERT INTO posts_archive SELECT ... FROM moved LEFT JOIN post_views ...
+
+SKIP LOCKED пропускает строки, которые сейчас меняют другие транзакции,
+поэтому архиватор не ждёт писателей и не блокирует их дольше одного
+пакета; несколько архиваторов делят работу без конфликтов. Просмотры
+переносятся вместе с постом. Счётчики не меняются: удалённые посты в них
+уже не учитываются.
+
+Состояние между пакетами не хранится: очередь — это сами удалённые
+строки в posts (частичный индекс ix_posts_deleted_at), поэтому
+после остановки или сбоя следующий запуск продолжает с того же места, а
+незавершённый пакет откатывается целиком.
+
+Перед каждым пакетом проверяется отставание реплик по
+pg_stat_replication.replay_lag; пока оно больше max_replication_lag,
+архиватор ждёт.
+
+Восстановление и чтение архивных постов — PostRepository.restore_post и
+PostRepository.get_archived_post.
+
+Разовый запуск: python -m src.infrastructure.archive --retention-days 30
+"""
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.infrastructure.models import Post, PostArchive, PostView
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLUMNS = ('uuid', 'title', 'text', 'is_published', 'created_at', 'deleted_at', 'author_id', 'views')
+
+
+@dataclass
+class ArchiveStats:
+    batches: int = 0
+    archived: int = 0
+    throttled: float = 0.0
+
+
+async def replication_lag(session: AsyncSession) -> float:
+    """Наибольшее отставание воспроизведения среди реплик, секунд; 0, если реплик нет."""
+    result = await session.execute(text(
+        'SELECT coalesce(max(extract(epoch FROM replay_lag)), 0) FROM pg_stat_replication'
+    ))
+    return float(result.scalar() or 0)
+
+
+class PostArchiver:
+    """Пакетный перенос удалённых постов старше retention в posts_archive."""
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            retention: timedelta = timedelta(days=30),
+            batch_size: int = 500,
+            pause: float = 0.1,
+            max_replication_lag: float | None = 5.0,
+            lag_check_interval: float = 1.0,
+    ):
+        self.retention = retention
+        self.batch_size = batch_size
+        self.pause = pause
+        self.max_replication_lag = max_replication_lag
+        self.lag_check_interval = lag_check_interval
+        self._session_maker = session_maker
+        self._task: asyncio.Task | None = None
+
+    def _archive_statement(self, cutoff: datetime):
+        batch = (
+            select(Post.uuid)
+            .where(Post.is_deleted == True, Post.deleted_at < cutoff)
+            .order_by(Post.deleted_at, Post.uuid)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .cte('batch')
+        )
+        moved = (
+            delete(Post)
+            .where(Post.uuid.in_(select(batch.c.uuid)))
+            .returning(
+                Post.uuid, Post.title, Post.text, Post.is_published, Post.created_at, Post.deleted_at, Post.author_id,
+            )
+            .cte('moved')
+        )
+        # Все части запроса видят один снимок, поэтому post_views ещё содержит
+        # строки, которые каскадно удалит DELETE из posts.
+        rows = select(
+            moved.c.uuid,
+            moved.c.title,
+            moved.c.text,
+            moved.c.is_published,
+            moved.c.created_at,
+            moved.c.deleted_at,
+            moved.c.author_id,
+            func.coalesce(PostView.views, 0),
+        ).select_from(moved.outerjoin(PostView, PostView.post_id == moved.c.uuid))
+
+        stmt = insert(PostArchive).from_select(list(ARCHIVE_COLUMNS), rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PostArchive.uuid],
+            set_={column: stmt.excluded[column] for column in ARCHIVE_COLUMNS if column != 'uuid'},
+        )
+        return stmt.returning(PostArchive.uuid)
+
+    async def archive_batch(self, cutoff: datetime) -> int:
+        """Переносит один пакет; возвращает число перенесённых постов."""
+        async with self._session_maker() as session:
+            result = await session.execute(self._archive_statement(cutoff))
+            archived = len(result.all())
+            await session.commit()
+        return archived
+
+    async def wait_for_replicas(self) -> float:
+        """Ждёт, пока отставание реплик не опустится до max_replication_lag; возвращает время ожидания."""
+        if self.max_replication_lag is None:
+            return 0.0
+
+        started = time.perf_counter()
+        while True:
+            async with self._session_maker() as session:
+                lag = await replication_lag(session)
+            if lag <= self.max_replication_lag:
+                return time.perf_counter() - started
+            logger.warning(
+                "Архивация постов приостановлена: отставание реплик %.1f с больше %.1f с",
+                lag, self.max_replication_lag,
+            )
+            await asyncio.sleep(self.lag_check_interval)
+
+    async def run(self, max_batches: int | None = None) -> ArchiveStats:
+        """Переносит пакеты, пока есть подходящие строки или не исчерпан max_batches."""
+        stats = ArchiveStats()
+        cutoff = datetime.now(tz=UTC).replace(tzinfo=None) - self.retention
+
+        while max_batches is None or stats.batches < max_batches:
+            stats.throttled += await self.wait_for_replicas()
+            archived = await self.archive_batch(cutoff)
+            if not archived:
+                break
+            stats.batches += 1
+            stats.archived += archived
+            await asyncio.sleep(self.pause)
+
+        if stats.archived:
+            logger.info(
+                "Перенесено в архив %s постов за %s пакетов, ожидание реплик %.1f с",
+                stats.archived, stats.batches, stats.throttled,
+            )
+        return stats
+
+    def start(self, interval: float = 3600.0) -> None:
+        """Запускает архивацию в фоне раз в interval секунд."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run_periodically(interval))
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run_periodically(self, interval: float) -> None:
+        while True:
+            try:
+                await self.run()
+            except Exception as e:
+                logger.error("Ошибка при архивации удалённых постов: %s", e)
+            await asyncio.sleep(interval)
+
+
+async def main(args: argparse.Namespace) -> None:
+    from src.config import settings
+    from src.infrastructure.database import new_session_maker
+
+    session_maker = new_session_maker(settings().psql_settings)
+    archiver = PostArchiver(
+        session_maker,
+        retention=timedelta(days=args.retention_days),
+        batch_size=args.batch_size,
+        pause=args.pause,
+        max_replication_lag=args.max_lag,
+    )
+    try:
+        stats = await archiver.run(args.max_batches)
+    finally:
+        await session_maker.kw['bind'].dispose()
+    print('archived %d posts in %d batches, waited for replicas %.1f s' % (
+        stats.archived, stats.batches, stats.throttled,
+    ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--retention-days', type=int, default=30)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--pause', type=float, default=0.1, help='пауза между пакетами, секунд')
+    parser.add_argument('--max-lag', type=float, default=5.0, help='допустимое отставание реплик, секунд')
+    parser.add_argument('--max-batches', type=int)
+    asyncio.run(main(parser.parse_args()))
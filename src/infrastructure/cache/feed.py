@@ -0,0 +1,50 @@
+from typing import Awaitable, Callable
+
+from src.entities.post import PostInfoAuthor
+from src.infrastructure.cache.ttl import CacheStats, TTLCache
+
+FeedLoader = Callable[[int], Awaitable[list[PostInfoAuthor] | None]]
+
+
+class _FeedUnavailable(Exception):
+    pass
+
+
+class FeedCache:
+    """Готовые первые страницы опубликованной ленты.
+
+    Хранит первые pages * page_size постов одним снимком, который строится
+    одним запросом и отдаёт любые срезы внутри этого окна. Снимок
+    сбрасывается после фиксации изменений постов и не реже раза в ttl
+    секунд, на случай публикаций в обход сервиса.
+    """
+
+    _KEY = 'feed'
+
+    def __init__(self, pages: int = 5, page_size: int = 20, ttl: float = 300.0):
+        self.window = pages * page_size
+        self._cache = TTLCache(maxsize=1, ttl=ttl)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def covers(self, skip: int, limit: int) -> bool:
+        return skip >= 0 and limit >= 0 and skip + limit <= self.window
+
+    def invalidate(self) -> None:
+        self._cache.invalidate(self._KEY)
+
+    async def get_page(self, skip: int, limit: int, loader: FeedLoader) -> list[PostInfoAuthor] | None:
+        async def load_window() -> tuple[PostInfoAuthor, ...]:
+            posts = await loader(self.window)
+            if posts is None:
+                raise _FeedUnavailable
+            return tuple(posts)
+
+        try:
+            posts = await self._cache.get_or_load(self._KEY, load_window)
+        except _FeedUnavailable:
+            return None
+
+        return list(posts[skip:skip + limit])
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TTLCache:
+    """Ограниченный LRU-кэш с TTL, кэшированием промахов и объединением конкурентных загрузок.
+
+    Значение None считается промахом в источнике и хранится negative_ttl секунд.
+    Пока ключ загружается, остальные запросы этого ключа ждут ту же загрузку.
+    invalidate() во время загрузки не даёт её результату попасть в кэш.
+    """
+
+    def __init__(
+            self,
+            maxsize: int = 10_000,
+            ttl: float = 60.0,
+            negative_ttl: float = 5.0,
+            timer: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stats = CacheStats()
+        self._timer = timer
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= self._timer():
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        if ttl is None:
+            ttl = self.negative_ttl if value is None else self.ttl
+
+        self._data[key] = (self._timer() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._inflight.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        future = self._inflight.get(key)
+        if future is not None:
+            await asyncio.wait([future])
+            if future.cancelled():
+                return await self.get_or_load(key, loader)
+            return future.result()
+
+        future = asyncio.get_running_loop().create_future()
+        # Исключение забирают ожидающие; без них оно не должно попадать в лог asyncio.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            self._finish_load(key, future)
+            future.cancel()
+            raise
+        except BaseException as e:
+            self._finish_load(key, future)
+            future.set_exception(e)
+            raise
+
+        if self._finish_load(key, future):
+            self.set(key, value)
+        future.set_result(value)
+        return value
+
+    def _finish_load(self, key: Hashable, future: asyncio.Future) -> bool:
+        """Снимает отметку о загрузке; False, если ключ успели инвалидировать."""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+            return True
+        return False
@@ -1,17 +1,144 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import time
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from sqlalchemy import URL
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from src.infrastructure.instrumentation import instrument_engine
+from src.infrastructure.routing import ReplicaSet, RoutingSession
+
+if TYPE_CHECKING:
+    from src.config import PostgresSettings
+
+
+@dataclass
+class PoolWaitStats:
+    acquisitions: int = 0
+    timeouts: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    def record(self, waited: float) -> None:
+        self.acquisitions += 1
+        self.wait_total += waited
+        if waited > self.wait_max:
+            self.wait_max = waited
+
+
+@dataclass(frozen=True)
+class PoolStatus:
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    acquisitions: int
+    timeouts: int
+    wait_avg: float
+    wait_max: float
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, замеряющий время ожидания свободного соединения."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.wait_stats.timeouts += 1
+            raise
+        finally:
+            self.wait_stats.record(time.perf_counter() - started)
+
+
+def pool_status(engine: AsyncEngine) -> PoolStatus:
+    pool = engine.sync_engine.pool
+    wait_stats = getattr(pool, 'wait_stats', PoolWaitStats())
+
+    return PoolStatus(
+        size=pool.size(),
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        overflow=pool.overflow(),
+        acquisitions=wait_stats.acquisitions,
+        timeouts=wait_stats.timeouts,
+        wait_avg=wait_stats.wait_total / wait_stats.acquisitions if wait_stats.acquisitions else 0.0,
+        wait_max=wait_stats.wait_max,
+    )
 
-from src.config import PostgresSettings
 
+def new_engine(psql_settings: 'PostgresSettings', host: str | None = None, port: int | None = None) -> AsyncEngine:
+    statement_cache_size = 0 if psql_settings.PGBOUNCER_TRANSACTION_MODE else psql_settings.STATEMENT_CACHE_SIZE
 
-def new_session_maker(psql_settings: PostgresSettings) -> async_sessionmaker[AsyncSession]:
-    database_uri = "postgresql+asyncpg://{user}:{password}@{host}:{port}/{db}".format(
-        user=psql_settings.POSTGRES_USER,
+    database_uri = URL.create(
+        drivername="postgresql+asyncpg",
+        username=psql_settings.POSTGRES_USER,
         password=psql_settings.POSTGRES_PASSWORD,
-        host=psql_settings.POSTGRES_HOST,
-        port=psql_settings.POSTGRES_PORT,
-        db=psql_settings.POSTGRES_DB,
+        host=host or psql_settings.POSTGRES_HOST,
+        port=port or psql_settings.POSTGRES_PORT,
+        database=psql_settings.POSTGRES_DB,
+        query={"prepared_statement_cache_size": str(statement_cache_size)},
     )
 
-    engine = create_async_engine(url=database_uri)
-    return async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    connect_args = {"statement_cache_size": statement_cache_size}
+    if psql_settings.PGBOUNCER_TRANSACTION_MODE:
+        # Уникальные имена не конфликтуют с выражениями, оставшимися на
+        # серверном соединении от другого клиента PgBouncer.
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+
+    engine = create_async_engine(
+        url=database_uri,
+        poolclass=InstrumentedQueuePool,
+        pool_size=psql_settings.POOL_SIZE,
+        max_overflow=psql_settings.POOL_MAX_OVERFLOW,
+        pool_timeout=psql_settings.POOL_TIMEOUT,
+        pool_recycle=psql_settings.POOL_RECYCLE,
+        pool_pre_ping=psql_settings.POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+    if psql_settings.SQL_INSTRUMENTATION:
+        instrument_engine(
+            engine,
+            slow_query_ms=psql_settings.SLOW_QUERY_MS,
+            n_plus_one_threshold=psql_settings.N_PLUS_ONE_THRESHOLD,
+        )
+    return engine
+
+
+def new_replica_set(psql_settings: 'PostgresSettings') -> ReplicaSet | None:
+    if not psql_settings.POSTGRES_REPLICA_HOSTS:
+        return None
+
+    engines = []
+    for address in psql_settings.POSTGRES_REPLICA_HOSTS:
+        host, _, port = address.partition(':')
+        engines.append(new_engine(psql_settings, host=host, port=int(port) if port else None))
+
+    return ReplicaSet(engines, selection=psql_settings.REPLICA_SELECTION)
+
+
+def new_session_maker(psql_settings: 'PostgresSettings') -> async_sessionmaker[AsyncSession]:
+    engine = new_engine(psql_settings)
+    replicas = new_replica_set(psql_settings)
+
+    if replicas is None:
+        return async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+    return async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        replicas=replicas,
+        autoflush=False,
+        expire_on_commit=False,
+    )
@@ -0,0 +1,178 @@
+"""Проверка планов запросов репозиториев через EXPLAIN.
+
+Каждый метод репозитория выполняется в точке сохранения, которая затем
+откатывается; все отправленные им запросы перехватываются и прогоняются
+через EXPLAIN с выключенным seq scan. Если планировщик всё равно выбирает
+последовательное сканирование горячей таблицы, значит подходящего индекса нет.
+
+Запуск: python -m src.infrastructure.explain
+"""
+import asyncio
+import json
+import logging
+import sys
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator
+
+from sqlalchemy import event, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.infrastructure.models import Author, Post, PostView
+from src.infrastructure.repository.author import AuthorRepository
+from src.infrastructure.repository.post import PostRepository
+
+logger = logging.getLogger(__name__)
+
+HOT_TABLES = frozenset({Post.__tablename__, Author.__tablename__, PostView.__tablename__})
+
+Operation = Callable[[AsyncSession], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class PlanViolation:
+    operation: str
+    statement: str
+    node_type: str
+    relation: str
+
+
+@contextmanager
+def capture_statements(engine: AsyncEngine) -> Iterator[list[tuple[str, Any]]]:
+    """Собирает (statement, parameters) всех запросов, отправленных движком."""
+    statements: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(('EXPLAIN', 'SET ', 'SAVEPOINT', 'ROLLBACK', 'RELEASE')):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def find_seq_scans(plan: dict, tables: frozenset[str] = HOT_TABLES) -> Iterator[tuple[str, str]]:
+    """Обходит JSON-план и возвращает узлы последовательного сканирования горячих таблиц."""
+    node_type = plan.get('Node Type')
+    relation = plan.get('Relation Name')
+    if node_type == 'Seq Scan' and relation in tables:
+        yield node_type, relation
+
+    for child in plan.get('Plans', ()):
+        yield from find_seq_scans(child, tables)
+
+
+def repository_operations(post_id: str, author_id: str) -> dict[str, Operation]:
+    """Вызовы всех методов репозиториев с правдоподобными аргументами."""
+    return {
+        'PostRepository.get_post_by_id': lambda s: PostRepository(s).get_post_by_id(post_id),
+        'PostRepository.get_posts_by_ids': lambda s: PostRepository(s).get_posts_by_ids([post_id]),
+        'PostRepository.get_post_list_by_limit': lambda s: PostRepository(s).get_post_list_by_limit(0, 10),
+        'PostRepository.get_post_list_by_cursor': lambda s: PostRepository(s).get_post_list_by_cursor(None, 10),
+        'PostRepository.get_post_summaries': lambda s: PostRepository(s).get_post_summaries(None, 10),
+        'PostRepository.search_posts': lambda s: PostRepository(s).search_posts('explain', None, 10),
+        'PostRepository.suggest_posts': lambda s: PostRepository(s).suggest_posts('explain', 10),
+        'PostRepository.get_most_viewed_posts': lambda s: PostRepository(s).get_most_viewed_posts(10),
+        'PostRepository.get_posts_by_author': lambda s: PostRepository(s).get_posts_by_author(author_id, 0, 10),
+        'PostRepository.get_posts_by_author_by_cursor': (
+            lambda s: PostRepository(s).get_posts_by_author_by_cursor(author_id, None, 10)
+        ),
+        'PostRepository.count_published_posts': lambda s: PostRepository(s).count_published_posts(),
+        'PostRepository.count_posts_by_author': lambda s: PostRepository(s).count_posts_by_author(author_id),
+        'PostRepository.delete_post': lambda s: PostRepository(s).delete_post(post_id, author_id),
+        'PostRepository.update_post': lambda s: PostRepository(s).update_post(post_id, author_id, 'explain'),
+        'PostRepository.get_archived_post': lambda s: PostRepository(s).get_archived_post(post_id),
+        'PostRepository.restore_post': lambda s: PostRepository(s).restore_post(post_id, author_id),
+        'AuthorRepository.get_author_by_id': lambda s: AuthorRepository(s).get_author_by_id(author_id),
+        'AuthorRepository.get_authors_by_ids': lambda s: AuthorRepository(s).get_authors_by_ids([author_id]),
+        'AuthorRepository.suggest_authors': lambda s: AuthorRepository(s).suggest_authors('explain', 10),
+        'AuthorRepository.get_author_by_email': lambda s: AuthorRepository(s).get_author_by_email('explain@example.com'),
+        'AuthorRepository.get_author_list_by_limit': lambda s: AuthorRepository(s).get_author_list_by_limit(0, 10),
+        'AuthorRepository.get_author_list_by_cursor': lambda s: AuthorRepository(s).get_author_list_by_cursor(None, 10),
+        'AuthorRepository.count_authors': lambda s: AuthorRepository(s).count_authors(),
+        'AuthorRepository.delete_author': lambda s: AuthorRepository(s).delete_author(author_id),
+        'AuthorRepository.change_password': lambda s: AuthorRepository(s).change_password(author_id, 'explain'),
+    }
+
+
+async def _sample_ids(session: AsyncSession) -> tuple[str, str]:
+    row = (await session.execute(select(Post.uuid, Post.author_id).limit(1))).first()
+    if row:
+        return f"{row.uuid}", f"{row.author_id}"
+    return uuid.uuid4().hex, uuid.uuid4().hex
+
+
+async def check_repository_plans(
+        session_maker: async_sessionmaker[AsyncSession],
+        operations: dict[str, Operation] | None = None,
+) -> list[PlanViolation]:
+    engine = session_maker.kw['bind']
+    violations: list[PlanViolation] = []
+
+    async with session_maker() as session:
+        if operations is None:
+            operations = repository_operations(*await _sample_ids(session))
+
+        await session.execute(text('SET LOCAL enable_seqscan = off'))
+        conn = await session.connection()
+
+        for name, operation in operations.items():
+            savepoint = await session.begin_nested()
+            with capture_statements(engine) as statements:
+                try:
+                    await operation(session)
+                except Exception as e:
+                    logger.warning("Операция %s завершилась ошибкой: %s", name, e)
+            await savepoint.rollback()
+
+            for statement, parameters in statements:
+                savepoint = await session.begin_nested()
+                try:
+                    result = await conn.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + statement, parameters)
+                    plan = result.scalar()
+                except DBAPIError as e:
+                    logger.warning("Не удалось выполнить EXPLAIN для %s: %s", name, e)
+                    continue
+                finally:
+                    await savepoint.rollback()
+
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+
+                for node_type, relation in find_seq_scans(plan[0]['Plan']):
+                    violations.append(PlanViolation(name, statement, node_type, relation))
+
+        await session.rollback()
+
+    return violations
+
+
+async def main() -> int:
+    from src.config import settings
+    from src.infrastructure.database import new_session_maker
+
+    session_maker = new_session_maker(settings().psql_settings)
+    try:
+        violations = await check_repository_plans(session_maker)
+    finally:
+        await session_maker.kw['bind'].dispose()
+
+    for violation in violations:
+        print(
+            '%s: %s по таблице %s\n    %s' % (
+                violation.operation,
+                violation.node_type,
+                violation.relation,
+                ' '.join(violation.statement.split()),
+            ),
+            file=sys.stderr,
+        )
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
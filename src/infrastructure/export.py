@@ -0,0 +1,79 @@
+"""Потоковые кодировщики выгрузки постов.
+
+Пишут в любой приёмник с методом write(bytes): бинарный файл, сокет или
+asyncio.StreamWriter. Если у приёмника есть корутина drain(), она
+вызывается после каждого сброса буфера, чтобы медленный клиент не
+раздувал память процесса.
+"""
+import csv
+import inspect
+import io
+from typing import AsyncIterable, Protocol
+
+from src.entities.post import FullPostInfo
+from src.infrastructure.serialization import to_json_line
+
+POST_FIELDS = ('uuid', 'title', 'text', 'is_published', 'is_deleted', 'created_at', 'author_id')
+
+
+class Sink(Protocol):
+
+    def write(self, data: bytes):
+        pass
+
+
+async def _flush(sink: Sink, data: bytes) -> None:
+    result = sink.write(data)
+    if inspect.isawaitable(result):
+        await result
+
+    drain = getattr(sink, 'drain', None)
+    if drain is not None:
+        await drain()
+
+
+async def write_ndjson(posts: AsyncIterable[FullPostInfo], sink: Sink, buffer_size: int = 64 * 1024) -> int:
+    """Пишет посты по одному JSON-объекту на строку; возвращает число записей."""
+    buffer = bytearray()
+    count = 0
+
+    async for post in posts:
+        buffer += to_json_line(post)
+        count += 1
+
+        if len(buffer) >= buffer_size:
+            await _flush(sink, bytes(buffer))
+            buffer.clear()
+
+    if buffer:
+        await _flush(sink, bytes(buffer))
+    return count
+
+
+async def write_csv(posts: AsyncIterable[FullPostInfo], sink: Sink, buffer_size: int = 64 * 1024) -> int:
+    """Пишет посты в CSV с заголовком; возвращает число записей."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(POST_FIELDS)
+    count = 0
+
+    async for post in posts:
+        writer.writerow((
+            post.uuid,
+            post.title,
+            post.text,
+            post.is_published,
+            post.is_deleted,
+            post.created_at.isoformat(),
+            post.author_id,
+        ))
+        count += 1
+
+        if buffer.tell() >= buffer_size:
+            await _flush(sink, buffer.getvalue().encode())
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        await _flush(sink, buffer.getvalue().encode())
+    return count
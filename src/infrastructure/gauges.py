@@ -0,0 +1,69 @@
+"""Датчики инфраструктуры для реестра метрик: пул соединений, кэши, SQL."""
+from typing import Mapping
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.infrastructure.cache.feed import FeedCache
+from src.infrastructure.cache.ttl import TTLCache
+from src.infrastructure.database import pool_status
+from src.infrastructure.instrumentation import sql_stats
+from src.metrics import Labels, Registry, labels, registry as default_registry
+
+# Поле -> (имя метрики, описание, тип).
+POOL_FIELDS = {
+    'size': ('db_pool_size', 'Размер пула соединений.', 'gauge'),
+    'checked_out': ('db_pool_checked_out', 'Соединения, выданные из пула.', 'gauge'),
+    'checked_in': ('db_pool_checked_in', 'Свободные соединения в пуле.', 'gauge'),
+    'overflow': ('db_pool_overflow', 'Соединения сверх pool_size.', 'gauge'),
+    'wait_avg': ('db_pool_wait_avg_seconds', 'Среднее ожидание свободного соединения.', 'gauge'),
+    'wait_max': ('db_pool_wait_max_seconds', 'Максимальное ожидание свободного соединения.', 'gauge'),
+    'timeouts': ('db_pool_timeouts_total', 'Тайм-ауты ожидания соединения.', 'counter'),
+}
+
+CACHE_FIELDS = {
+    'hit_ratio': ('cache_hit_ratio', 'Доля попаданий в кэш.', 'gauge'),
+    'hits': ('cache_hits_total', 'Попадания в кэш.', 'counter'),
+    'misses': ('cache_misses_total', 'Промахи кэша.', 'counter'),
+    'evictions': ('cache_evictions_total', 'Вытеснения из кэша по размеру.', 'counter'),
+    'expirations': ('cache_expirations_total', 'Записи кэша, истёкшие по TTL.', 'counter'),
+}
+
+
+def register_pool_gauges(engines: Mapping[str, AsyncEngine], registry: Registry = default_registry) -> None:
+    """Состояние пулов: engines — например {'primary': engine, 'replica-1': ...}."""
+    def sample(field: str):
+        def callback() -> dict[Labels, float]:
+            return {labels(engine=name): getattr(pool_status(engine), field) for name, engine in engines.items()}
+        return callback
+
+    for field, (name, documentation, metric_type) in POOL_FIELDS.items():
+        registry.gauge(name, documentation, sample(field), metric_type)
+
+
+def register_cache_gauges(caches: Mapping[str, TTLCache | FeedCache], registry: Registry = default_registry) -> None:
+    def sample(field: str):
+        def callback() -> dict[Labels, float]:
+            return {labels(cache=name): getattr(cache.stats, field) for name, cache in caches.items()}
+        return callback
+
+    for field, (name, documentation, metric_type) in CACHE_FIELDS.items():
+        registry.gauge(name, documentation, sample(field), metric_type)
+
+
+def register_sql_gauges(registry: Registry = default_registry) -> None:
+    """Статистика инструментирования SQL по методам репозиториев (если оно включено)."""
+    registry.gauge(
+        'sql_statements_total', 'Выполненные запросы по методам репозиториев.',
+        lambda: {labels(operation=name): stats.statements for name, stats in sql_stats().items()},
+        'counter',
+    )
+    registry.gauge(
+        'sql_statement_seconds_total', 'Суммарное время запросов по методам репозиториев.',
+        lambda: {labels(operation=name): stats.total for name, stats in sql_stats().items()},
+        'counter',
+    )
+    registry.gauge(
+        'sql_slow_statements_total', 'Медленные запросы по методам репозиториев.',
+        lambda: {labels(operation=name): stats.slow for name, stats in sql_stats().items()},
+        'counter',
+    )
@@ -0,0 +1,125 @@
+"""Групповая фиксация мелких записей.
+
+Каждая одиночная запись через сервис — это отдельный COMMIT и отдельный
+fsync WAL. GroupCommitter собирает операции, пришедшие в течение
+max_delay (или пока не наберётся max_batch), выполняет их в одной сессии,
+каждую в своей точке сохранения, и фиксирует одним COMMIT. Ошибка одной
+операции откатывает только её точку сохранения; вызывающий получает
+результат только после фиксации, так что гарантия долговечности та же,
+что и у обычного commit(), а задержка вырастает не больше чем на
+max_delay.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+Operation = Callable[[AsyncSession], Awaitable[Any]]
+
+
+@dataclass
+class GroupCommitStats:
+    batches: int = 0
+    operations: int = 0
+    failed_batches: int = 0
+
+    @property
+    def operations_per_commit(self) -> float:
+        return self.operations / self.batches if self.batches else 0.0
+
+
+class GroupCommitter:
+    """Объединяет конкурентные мелкие записи в общие транзакции."""
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            max_batch: int = 64,
+            max_delay: float = 0.005,
+    ):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.stats = GroupCommitStats()
+        self._session_maker = session_maker
+        self._pending: list[tuple[Operation, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def submit(self, operation: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """Выполняет operation(session) в ближайшей группе и ждёт её фиксации."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((operation, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+
+        return await future
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[tuple[Operation, asyncio.Future]]) -> None:
+        try:
+            await self._flush_batch(batch)
+        finally:
+            # Отмена группы (например, при остановке) не должна оставлять
+            # вызывающих ждать вечно: итог неизвестен, их ожидание отменяется.
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+    async def _flush_batch(self, batch: list[tuple[Operation, asyncio.Future]]) -> None:
+        outcomes: list[tuple[asyncio.Future, Any, BaseException | None]] = []
+
+        try:
+            async with self._session_maker() as session:
+                for operation, future in batch:
+                    savepoint = await session.begin_nested()
+                    try:
+                        result = await operation(session)
+                        await savepoint.commit()
+                        outcomes.append((future, result, None))
+                    except Exception as e:
+                        await savepoint.rollback()
+                        outcomes.append((future, None, e))
+                await session.commit()
+        except Exception as e:
+            self.stats.failed_batches += 1
+            logger.error("Ошибка при групповой фиксации %s операций: %s", len(batch), e)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats.batches += 1
+        self.stats.operations += len(batch)
+        for future, result, error in outcomes:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Фиксирует накопленные операции и дожидается незавершённых групп."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
@@ -0,0 +1,160 @@
+"""Инструментирование SQL: время и число строк по методам репозиториев.
+
+Методы классов, помеченных @instrumented, выставляют current_operation
+("PostRepository.get_post_by_id"); обработчики событий движка относят к
+этой операции каждый выполненный запрос. Дополнительно:
+
+- запросы дольше slow_query_ms пишутся в лог с текстом и операцией;
+- в пределах одной транзакции соединения (как правило, одного вызова
+  сервиса, который завершается commit или rollback) считаются одинаковые
+  тексты запросов. Параметры в текст не входят, поэтому повторы — это
+  запросы, отличающиеся только значениями, то есть типичный N+1. Когда
+  число повторов достигает n_plus_one_threshold, пишется предупреждение.
+"""
+import functools
+import inspect
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+UNKNOWN_OPERATION = '<unknown>'
+
+current_operation: ContextVar[str | None] = ContextVar('current_operation', default=None)
+
+
+@dataclass
+class StatementStats:
+    statements: int = 0
+    rows: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    slow: int = 0
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.statements if self.statements else 0.0
+
+
+_stats: dict[str, StatementStats] = {}
+
+
+def sql_stats() -> dict[str, StatementStats]:
+    """Накопленная статистика по операциям."""
+    return dict(_stats)
+
+
+def reset_sql_stats() -> None:
+    _stats.clear()
+
+
+def _wrap(name: str, method: Any) -> Any:
+    if inspect.isasyncgenfunction(method):
+        # Операция выставляется только на время шага генератора: между шагами
+        # код потребителя выполняет свои запросы, а закрыть генератор могут
+        # из другого контекста (другой задачи или финализатора цикла).
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            generator = method(*args, **kwargs)
+            try:
+                while True:
+                    token = current_operation.set(name)
+                    try:
+                        item = await generator.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        current_operation.reset(token)
+                    yield item
+            finally:
+                token = current_operation.set(name)
+                try:
+                    await generator.aclose()
+                finally:
+                    current_operation.reset(token)
+        return wrapper
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = current_operation.set(name)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            current_operation.reset(token)
+    return wrapper
+
+
+def instrumented(cls: type[T]) -> type[T]:
+    """Декоратор класса: публичные асинхронные методы выставляют current_operation."""
+    for attribute, method in list(vars(cls).items()):
+        if attribute.startswith('_'):
+            continue
+        if inspect.iscoroutinefunction(method) or inspect.isasyncgenfunction(method):
+            setattr(cls, attribute, _wrap('%s.%s' % (cls.__name__, attribute), method))
+    return cls
+
+
+def _short(statement: str, limit: int = 500) -> str:
+    statement = ' '.join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + '...'
+
+
+def instrument_engine(
+        engine: AsyncEngine,
+        slow_query_ms: float | None = None,
+        n_plus_one_threshold: int | None = None,
+) -> None:
+    """Подключает сбор статистики, журнал медленных запросов и поиск N+1 к движку."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._instrument_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._instrument_started
+        operation = current_operation.get() or UNKNOWN_OPERATION
+
+        stats = _stats.get(operation)
+        if stats is None:
+            stats = _stats[operation] = StatementStats()
+        stats.statements += 1
+        stats.total += elapsed
+        if elapsed > stats.max:
+            stats.max = elapsed
+        if cursor.rowcount and cursor.rowcount > 0:
+            stats.rows += cursor.rowcount
+
+        if slow_query_ms is not None and elapsed * 1000 >= slow_query_ms:
+            stats.slow += 1
+            logger.warning(
+                "Медленный запрос %.1f мс в %s: %s", elapsed * 1000, operation, _short(statement),
+            )
+
+        if n_plus_one_threshold:
+            seen = conn.info.setdefault('instrument_statements', Counter())
+            seen[statement] += 1
+            if seen[statement] == n_plus_one_threshold:
+                logger.warning(
+                    "Возможный N+1: запрос выполнен %s раз в одной транзакции (%s): %s",
+                    n_plus_one_threshold, operation, _short(statement),
+                )
+
+    if n_plus_one_threshold:
+        @event.listens_for(sync_engine, 'commit')
+        def commit(conn):
+            conn.info.pop('instrument_statements', None)
+
+        @event.listens_for(sync_engine, 'rollback')
+        def rollback(conn):
+            conn.info.pop('instrument_statements', None)
@@ -1,15 +1,119 @@
+import atexit
+import json
 import logging
+import queue
+from datetime import datetime, UTC
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
+LOG_FORMAT = "[%(asctime)s.%(msecs)03d] %(module)10s:%(lineno)-3d %(levelname)-7s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-def configure_logging(level=logging.INFO):
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись — одна JSON-строка."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, UTC).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'line': record.lineno,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает долю записей ниже WARNING для указанных логгеров.
+
+    rates задаёт долю по имени логгера или его префиксу, например
+    {'src.application.services.auth': 0.01}. Отбор детерминированный:
+    пропускается каждая 1/rate запись. Предупреждения и ошибки не
+    отбрасываются никогда.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._counters: dict[str, int] = {}
+
+    def _rate(self, name: str) -> float | None:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        rate = self._rate(record.name)
+        if rate is None or rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+
+        seen = self._counters.get(record.name, 0)
+        self._counters[record.name] = seen + 1
+        return seen % round(1 / rate) == 0
+
+
+def configure_logging(
+        level=logging.INFO,
+        queued: bool = False,
+        json_format: bool = False,
+        filename: str = "blog.log",
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        sampling: dict[str, float] | None = None,
+) -> QueueListener | None:
+    """Настраивает корневой логгер.
+
+    В режиме queued корневой логгер только кладёт записи в очередь, а запись
+    в консоль и файл выполняет поток QueueListener, так что цикл событий не
+    ждёт диска. Возвращает запущенный listener; он останавливается при
+    повторной настройке или выходе из процесса, сбрасывая оставшиеся записи.
+    """
+    global _listener
+    stop_logging()
+
+    formatter = JsonFormatter() if json_format else logging.Formatter(LOG_FORMAT, DATE_FORMAT)
     handlers = [
         logging.StreamHandler(),
-        logging.FileHandler("blog.log")
+        RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'),
     ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    if queued:
+        _listener = QueueListener(queue.SimpleQueue(), *handlers, respect_handler_level=True)
+        queue_handler = QueueHandler(_listener.queue)
+        # Оформление записи выполняют обработчики listener.
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        handlers = [queue_handler]
+        _listener.start()
+
+    if sampling:
+        for handler in handlers:
+            handler.addFilter(SamplingFilter(sampling))
+
+    logging.basicConfig(level=level, handlers=handlers, force=True)
+    return _listener
+
 
-    logging.basicConfig(
-        level=level,
-        datefmt="%Y-%m-%d %H:%M:%S",
-        format="[%(asctime)s.%(msecs)03d] %(module)10s:%(lineno)-3d %(levelname)-7s - %(message)s",
-        handlers=handlers,
-    )
+@atexit.register
+def stop_logging() -> None:
+    """Дожидается записи всех записей из очереди, останавливает listener и закрывает его обработчики."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        # Обработчики listener не висят на корневом логгере, и basicConfig(force=True) их не закроет.
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -14,14 +14,16 @@ from alembic import context
 # access to the values within the .ini file in use.
 config = context.config
 
+psql_settings = settings().psql_settings
+
 config.set_main_option(
     'sqlalchemy.url',
     'postgresql+asyncpg://{user}:{password}@{host}:{port}/{db}'.format(
-        user=settings.psql_settings.POSTGRES_USER,
-        password=settings.psql_settings.POSTGRES_PASSWORD,
-        host=settings.psql_settings.POSTGRES_HOST,
-        port=settings.psql_settings.POSTGRES_PORT,
-        db=settings.psql_settings.POSTGRES_DB,
+        user=psql_settings.POSTGRES_USER,
+        password=psql_settings.POSTGRES_PASSWORD,
+        host=psql_settings.POSTGRES_HOST,
+        port=psql_settings.POSTGRES_PORT,
+        db=psql_settings.POSTGRES_DB,
     )
 )
 
@@ -0,0 +1,44 @@
+"""Post indexes
+
+Revision ID: 3f1c9a7e52b4
+Revises: 8172d7231b24
+Create Date: 2026-10-18 10:00:12.418532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7e52b4'
+down_revision: Union[str, Sequence[str], None] = '8172d7231b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_posts_feed',
+            'posts',
+            [sa.text('created_at DESC'), sa.text('uuid DESC')],
+            postgresql_where=sa.text('is_published AND NOT is_deleted'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_posts_author_id_created_at',
+            'posts',
+            ['author_id', sa.text('created_at DESC'), sa.text('uuid DESC')],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_posts_author_id_created_at', table_name='posts', postgresql_concurrently=True)
+        op.drop_index('ix_posts_feed', table_name='posts', postgresql_concurrently=True)
@@ -0,0 +1,49 @@
+"""Trigram indexes
+
+Revision ID: c27d5b8e1f90
+Revises: a94e07d6c215
+Create Date: 2026-10-18 12:15:03.551207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27d5b8e1f90'
+down_revision: Union[str, Sequence[str], None] = 'a94e07d6c215'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # GiST, а не GIN: только он умеет отдавать ближайших соседей по <<->.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_posts_title_trgm',
+            'posts',
+            ['title'],
+            postgresql_using='gist',
+            postgresql_ops={'title': 'gist_trgm_ops'},
+            postgresql_where=sa.text('is_published AND NOT is_deleted'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_authors_name_trgm',
+            'authors',
+            ['name'],
+            postgresql_using='gist',
+            postgresql_ops={'name': 'gist_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_authors_name_trgm', table_name='authors', postgresql_concurrently=True)
+        op.drop_index('ix_posts_title_trgm', table_name='posts', postgresql_concurrently=True)
@@ -0,0 +1,44 @@
+"""Counters
+
+Revision ID: 5e8a3c61d0f7
+Revises: c27d5b8e1f90
+Create Date: 2026-10-18 13:00:29.870114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a3c61d0f7'
+down_revision: Union[str, Sequence[str], None] = 'c27d5b8e1f90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('counters',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # Начальные значения; записи, сделанные во время миграции, в них не попадут,
+    # поэтому запись в posts/authors на это время нужно остановить.
+    op.execute(
+        """
+        INSERT INTO counters (name, value)
+        SELECT 'posts:published', count(*) FROM posts WHERE is_published AND NOT is_deleted
+        UNION ALL
+        SELECT 'authors', count(*) FROM authors
+        UNION ALL
+        SELECT 'posts:author:' || author_id, count(*) FROM posts GROUP BY author_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('counters')
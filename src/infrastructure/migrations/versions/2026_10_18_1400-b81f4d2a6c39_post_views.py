@@ -0,0 +1,35 @@
+"""Post views
+
+Revision ID: b81f4d2a6c39
+Revises: 5e8a3c61d0f7
+Create Date: 2026-10-18 14:00:12.508317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f4d2a6c39'
+down_revision: Union[str, Sequence[str], None] = '5e8a3c61d0f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('post_views',
+    sa.Column('post_id', sa.Uuid(), nullable=False),
+    sa.Column('views', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.uuid'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+    op.create_index('ix_post_views_views', 'post_views', [sa.text('views DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_post_views_views', table_name='post_views')
+    op.drop_table('post_views')
@@ -0,0 +1,68 @@
+"""Posts archive
+
+Revision ID: d4e96b1a0c57
+Revises: b81f4d2a6c39
+Create Date: 2026-10-18 15:00:41.183604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e96b1a0c57'
+down_revision: Union[str, Sequence[str], None] = 'b81f4d2a6c39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    # Срок хранения уже удалённых постов отсчитывается от миграции.
+    op.execute("UPDATE posts SET deleted_at = timezone('utc', now()) WHERE is_deleted")
+    # Счётчики постов авторов больше не учитывают удалённые посты.
+    op.execute(
+        """
+        UPDATE counters SET value = live.posts
+        FROM (
+            SELECT 'posts:author:' || author_id AS name, count(*) FILTER (WHERE NOT is_deleted) AS posts
+            FROM posts GROUP BY author_id
+        ) AS live
+        WHERE counters.name = live.name
+        """
+    )
+    op.create_table('posts_archive',
+    sa.Column('uuid', sa.Uuid(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('is_published', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.Column('author_id', sa.Uuid(), nullable=False),
+    sa.Column('views', sa.BigInteger(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['authors.uuid'], ),
+    sa.PrimaryKeyConstraint('uuid')
+    )
+    op.create_index(op.f('ix_posts_archive_author_id'), 'posts_archive', ['author_id'], unique=False)
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_posts_deleted_at',
+            'posts',
+            ['deleted_at', 'uuid'],
+            postgresql_where=sa.text('is_deleted'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_posts_deleted_at', table_name='posts', postgresql_concurrently=True)
+    op.drop_index(op.f('ix_posts_archive_author_id'), table_name='posts_archive')
+    op.drop_table('posts_archive')
+    op.drop_column('posts', 'deleted_at')
@@ -1,10 +1,15 @@
 from uuid import uuid4
 from datetime import datetime, UTC
 
-from sqlalchemy import Uuid, Boolean, String, ForeignKey, Text, func
+from sqlalchemy import Uuid, Boolean, String, ForeignKey, Text, Index, Computed, BigInteger, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
+# Конфигурация russian разбирает латиницу через english_stem, поэтому подходит для обоих языков.
+SEARCH_CONFIG = "russian"
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -31,6 +36,77 @@ class Post(Base):
         default=lambda: datetime.now(tz=UTC).replace(tzinfo=None),
         server_default=func.now(),
     )
+    deleted_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(text, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     author_id: Mapped[str] = mapped_column(Uuid, ForeignKey("authors.uuid"))
     author: Mapped["Author"] = relationship(back_populates="posts")
+
+
+class Counter(Base):
+    """Точные счётчики строк, обновляемые в транзакциях изменений."""
+
+    __tablename__ = "counters"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class PostView(Base):
+    """Число просмотров поста; пишется пакетами из ViewCounter, а не на каждый просмотр."""
+
+    __tablename__ = "post_views"
+
+    post_id: Mapped[str] = mapped_column(Uuid, ForeignKey("posts.uuid", ondelete="CASCADE"), primary_key=True)
+    views: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class PostArchive(Base):
+    """Удалённые посты старше срока хранения, перенесённые из posts архиватором."""
+
+    __tablename__ = "posts_archive"
+
+    uuid: Mapped[str] = mapped_column(Uuid, primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    text: Mapped[str] = mapped_column(Text)
+    is_published: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(nullable=False)
+    author_id: Mapped[str] = mapped_column(Uuid, ForeignKey("authors.uuid"), index=True)
+    views: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    archived_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+
+
+Index(
+    "ix_posts_feed",
+    Post.created_at.desc(),
+    Post.uuid.desc(),
+    postgresql_where=Post.is_published & ~Post.is_deleted,
+)
+Index(
+    "ix_posts_search_vector",
+    Post.search_vector,
+    postgresql_using="gin",
+    postgresql_where=Post.is_published & ~Post.is_deleted,
+)
+Index(
+    "ix_posts_title_trgm",
+    Post.title,
+    postgresql_using="gist",
+    postgresql_ops={"title": "gist_trgm_ops"},
+    postgresql_where=Post.is_published & ~Post.is_deleted,
+)
+Index("ix_authors_name_trgm", Author.name, postgresql_using="gist", postgresql_ops={"name": "gist_trgm_ops"})
+Index("ix_posts_author_id_created_at", Post.author_id, Post.created_at.desc(), Post.uuid.desc())
+Index("ix_post_views_views", PostView.views.desc())
+# Очередь архиватора: удалённых строк в posts мало, поэтому индекс маленький.
+Index("ix_posts_deleted_at", Post.deleted_at, Post.uuid, postgresql_where=Post.is_deleted)
@@ -1,22 +1,33 @@
 import logging
+import uuid
+from typing import Any, AsyncIterable, Callable, Iterable
+
+from asyncpg import PostgresError
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import select, update, delete, insert
+from sqlalchemy import select, update, delete, insert, any_, bindparam, literal, Uuid, String, Float
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from src.application.interfaces.repository.author import IAuthorRepository
 from src.application.exceptions.exp_repository import (
     NotFoundInfoException,
     NotPerformedActionException,
 )
+from src.entities.page import CursorPage, CountMode
 
-from src.entities.author import FullAuthorInfo, AuthorInfo
-from src.entities.outcome import OutcomeMsgInfo, EntityName, EntityAct
+from src.entities.author import FullAuthorInfo, AuthorInfo, AuthorImportInfo, AuthorSuggestionInfo
+from src.entities.outcome import OutcomeMsgInfo, EntityName, EntityAct, BulkImportInfo
+from src.infrastructure.instrumentation import instrumented
 from src.infrastructure.models import Author
+from src.infrastructure.repository.bulk import copy_records, iter_chunks
+from src.infrastructure.repository.counters import AUTHORS, bump_counters, estimate_rows, read_counter
+from src.infrastructure.repository.cursor import decode_author_cursor, encode_author_cursor, parse_uuids, split_page
 
 logger = logging.getLogger(__name__)
 
 
+@instrumented
 class AuthorRepository(IAuthorRepository):
     """Репозиторий для работы с авторами."""
 
@@ -47,6 +58,30 @@ class AuthorRepository(IAuthorRepository):
         except SQLAlchemyError as e:
             logger.error("Ошибка при совершении запроса на получение автора по id: %s", e)
 
+    async def get_authors_by_ids(self, author_ids: Iterable[str]) -> list[FullAuthorInfo]:
+        ids = parse_uuids(author_ids)
+        if not ids:
+            return []
+
+        query = select(
+            Author.uuid,
+            Author.name,
+            Author.email,
+        ).where(Author.uuid == any_(bindparam('author_ids', ids, type_=ARRAY(Uuid))))
+
+        try:
+            result = await self._session.execute(query)
+
+            return [
+                FullAuthorInfo(
+                    uuid=f"{row.uuid}",
+                    name=row.name,
+                    email=row.email,
+                ) for row in result.all()
+            ]
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при совершении запроса на получение авторов по списку id: %s", e)
+
     async def get_author_list_by_limit(self, skip: int = 0, limit: int = 100) -> list[AuthorInfo]:
         query = select(Author.name, Author.email).offset(skip).limit(limit)
 
@@ -63,6 +98,71 @@ class AuthorRepository(IAuthorRepository):
         except SQLAlchemyError as e:
             logger.error("Ошибка при совершении запроса на получение всех авторов: %s", e)
 
+    async def get_author_list_by_cursor(
+            self,
+            cursor: str | None = None,
+            limit: int = 100,
+            count: CountMode | None = None,
+    ) -> CursorPage[AuthorInfo]:
+        query = select(Author.uuid, Author.name, Author.email)
+
+        if cursor is not None:
+            query = query.where(Author.uuid > decode_author_cursor(cursor))
+
+        query = query.order_by(Author.uuid).limit(limit + 1)
+
+        try:
+            result = await self._session.execute(query)
+            rows, next_cursor = split_page(result.all(), limit, lambda row: encode_author_cursor(row.uuid))
+
+            return CursorPage(
+                items=[
+                    AuthorInfo(
+                        name=row.name,
+                        email=row.email,
+                    ) for row in rows
+                ],
+                next_cursor=next_cursor,
+                total=await self._count_authors(count) if count else None,
+            )
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при совершении запроса на получение авторов по курсору: %s", e)
+
+    async def _count_authors(self, mode: CountMode) -> int:
+        if mode == CountMode.estimate:
+            estimate = await estimate_rows(self._session, Author.__tablename__)
+            if estimate is not None:
+                return estimate
+        return await read_counter(self._session, AUTHORS)
+
+    async def count_authors(self, mode: CountMode = CountMode.exact) -> int | None:
+        try:
+            return await self._count_authors(mode)
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при совершении запроса на получение числа авторов: %s", e)
+
+    async def suggest_authors(self, prefix: str, limit: int = 10) -> list[AuthorSuggestionInfo]:
+        term = literal(prefix)
+        distance = term.op('<<->', return_type=Float)(Author.name)
+        query = select(
+            Author.uuid,
+            Author.name,
+            distance.label('distance'),
+        ).where(term.bool_op('<%')(Author.name)).order_by(distance).limit(limit)
+
+        try:
+            result = await self._session.execute(query)
+
+            return [
+                AuthorSuggestionInfo(
+                    uuid=f"{row.uuid}",
+                    name=row.name,
+                    score=1 - row.distance,
+                ) for row in result.all()
+            ]
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при совершении запроса на подбор подсказок по именам авторов: %s", e)
+
     async def get_author_by_email(self, email: str) -> FullAuthorInfo | None:
         query = select(
             Author.uuid,
@@ -104,6 +204,7 @@ class AuthorRepository(IAuthorRepository):
             new_author_data = result.fetchone()
 
             if new_author_data:
+                await bump_counters(self._session, {AUTHORS: 1})
                 return FullAuthorInfo(
                     uuid=f"{new_author_data.uuid}",
                     name=new_author_data.name,
@@ -112,6 +213,54 @@ class AuthorRepository(IAuthorRepository):
         except SQLAlchemyError as e:
             logger.error("Ошибка при совершении запроса на создание автора: %s", e)
 
+    async def bulk_create_authors(
+            self,
+            authors: Iterable[AuthorImportInfo] | AsyncIterable[AuthorImportInfo],
+            chunk_size: int = 5000,
+            on_progress: Callable[[BulkImportInfo], Any] | None = None,
+    ) -> BulkImportInfo | None:
+        columns = ('uuid', 'name', 'email')
+        report = BulkImportInfo(entity_name=EntityName.author.value)
+
+        try:
+            async for chunk in iter_chunks(authors, chunk_size):
+                emails = list({author.email for author in chunk})
+                result = await self._session.execute(
+                    select(Author.email).where(Author.email == any_(bindparam('emails', emails, type_=ARRAY(String))))
+                )
+                taken_emails = set(result.scalars().all())
+
+                rows = []
+                for author in chunk:
+                    try:
+                        author_id = uuid.UUID(f"{author.uuid}") if author.uuid else uuid.uuid4()
+                    except ValueError:
+                        author_id = None
+
+                    if author.email in taken_emails or author_id is None:
+                        report.rejected += 1
+                        continue
+
+                    taken_emails.add(author.email)
+                    rows.append((
+                        author_id,
+                        author.name,
+                        author.email,
+                    ))
+
+                if rows:
+                    await copy_records(self._session, Author.__tablename__, columns, rows)
+                    await bump_counters(self._session, {AUTHORS: len(rows)})
+
+                report.chunks += 1
+                report.inserted += len(rows)
+                if on_progress is not None:
+                    on_progress(report)
+
+            return report
+        except (SQLAlchemyError, PostgresError) as e:
+            logger.error("Ошибка при совершении массовой загрузки авторов: %s", e)
+
     async def delete_author(self, author_id: str) -> OutcomeMsgInfo | None:
         try:
             stmt = delete(Author).where(Author.uuid == author_id).returning(Author.uuid)
@@ -121,6 +270,8 @@ class AuthorRepository(IAuthorRepository):
             if delete_author_id is None:
                 raise NotPerformedActionException("Автор не был удален: %s" % author_id)
 
+            await bump_counters(self._session, {AUTHORS: -1})
+
             return OutcomeMsgInfo(
                 entity_id=f'{delete_author_id}',
                 entity_name=EntityName.author.value,
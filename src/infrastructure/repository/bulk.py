@@ -0,0 +1,33 @@
+from typing import AsyncIterable, AsyncIterator, Iterable, Sequence, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar('T')
+
+
+async def iter_chunks(records: Iterable[T] | AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    """Разбивает обычный или асинхронный поток записей на списки не длиннее size."""
+    chunk: list[T] = []
+
+    if isinstance(records, AsyncIterable):
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+
+    if chunk:
+        yield chunk
+
+
+async def copy_records(session: AsyncSession, table: str, columns: Sequence[str], records: list[tuple]) -> None:
+    """Загружает строки бинарным COPY на соединении сессии, внутри её транзакции."""
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(table, records=records, columns=list(columns))
@@ -0,0 +1,266 @@
+"""Кэширующие обёртки над репозиториями.
+
+TTLCache живёт всё время работы процесса и разделяется между запросами,
+обёртка же создаётся на каждый запрос вместе с сессией, репозиторием
+и менеджером транзакций. Записи сбрасываются только после commit(),
+поэтому читатели не получают устаревших данных после фиксации, а
+откаченные изменения кэш не трогают. Методы без кэширования
+делегируются исходному репозиторию.
+
+Если передан FeedCache, первые страницы get_post_list_by_limit отдаются
+из него; его сбрасывают только изменения, затрагивающие опубликованные
+посты.
+
+suggest_cache хранит подсказки по префиксу: одна и та же
+последовательность нажатий от разных пользователей идёт в базу один раз
+за TTL. Изменения его не сбрасывают, подсказки устаревают не дольше TTL.
+"""
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Hashable, Iterable
+
+from src.application.exceptions.exp_repository import NotFoundInfoException
+from src.application.interfaces.repository.author import IAuthorRepository
+from src.application.interfaces.repository.post import IPostRepository
+from src.application.interfaces.repository.tm import ITransactionManager
+from src.entities.author import FullAuthorInfo, AuthorImportInfo, AuthorSuggestionInfo
+from src.entities.outcome import OutcomeMsgInfo, BulkImportInfo
+from src.entities.post import FullPostInfo, PostImportInfo, PostInfo, PostInfoAuthor, PostSuggestionInfo
+from src.infrastructure.cache.feed import FeedCache
+from src.infrastructure.cache.ttl import TTLCache
+
+
+def entity_key(entity_id: Any) -> Hashable:
+    """Приводит идентификатор к UUID, чтобы hex и каноническая запись совпадали."""
+    try:
+        return uuid.UUID(f"{entity_id}")
+    except ValueError:
+        return entity_id
+
+
+class _UncachedResult(Exception):
+    """Репозиторий вернул None из-за ошибки запроса; такой результат не кэшируется."""
+
+
+async def _uncached_if_none(result: Awaitable[Any]) -> Any:
+    value = await result
+    if value is None:
+        raise _UncachedResult
+    return value
+
+
+@dataclass
+class _ImportSummary:
+    """Что из импортированных строк влияет на кэши; сами строки не хранятся."""
+    published: bool = False
+    explicit_ids: bool = False
+
+
+async def _summarize_import(
+        records: Iterable[Any] | AsyncIterable[Any],
+        summary: _ImportSummary,
+) -> AsyncIterator[Any]:
+    """Пропускает записи импорта насквозь, отмечая опубликованные и заданные id."""
+    if isinstance(records, AsyncIterable):
+        async for record in records:
+            summary.explicit_ids = summary.explicit_ids or record.uuid is not None
+            summary.published = summary.published or getattr(record, 'is_published', False)
+            yield record
+    else:
+        for record in records:
+            summary.explicit_ids = summary.explicit_ids or record.uuid is not None
+            summary.published = summary.published or getattr(record, 'is_published', False)
+            yield record
+
+
+class CachedPostRepository:
+    """Репозиторий постов с read-through кэшем get_post_by_id."""
+
+    def __init__(
+            self,
+            repository: IPostRepository,
+            tm: ITransactionManager,
+            cache: TTLCache,
+            feed_cache: FeedCache | None = None,
+            suggest_cache: TTLCache | None = None,
+    ):
+        self._repository = repository
+        self._tm = tm
+        self._cache = cache
+        self._feed_cache = feed_cache
+        self._suggest_cache = suggest_cache
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._repository, name)
+
+    def _invalidate_after_commit(self, post_id: str) -> None:
+        key = entity_key(post_id)
+        self._tm.after_commit(lambda: self._cache.invalidate(key))
+
+    def _invalidate_feed_after_commit(self) -> None:
+        if self._feed_cache is not None:
+            self._tm.after_commit(self._feed_cache.invalidate)
+
+    async def _load_post(self, post_id: str) -> FullPostInfo | None:
+        try:
+            return await _uncached_if_none(self._repository.get_post_by_id(post_id=post_id))
+        except NotFoundInfoException:
+            return None
+
+    async def get_post_by_id(self, post_id: str) -> FullPostInfo | None:
+        try:
+            post = await self._cache.get_or_load(entity_key(post_id), lambda: self._load_post(post_id))
+        except _UncachedResult:
+            return None
+
+        if post is None:
+            raise NotFoundInfoException("Пост с id %s не найден" % post_id)
+        return post
+
+    async def get_post_list_by_limit(self, skip: int, limit: int) -> list[PostInfoAuthor] | None:
+        if self._feed_cache is None or not self._feed_cache.covers(skip, limit):
+            return await self._repository.get_post_list_by_limit(skip=skip, limit=limit)
+
+        return await self._feed_cache.get_page(
+            skip,
+            limit,
+            lambda window: self._repository.get_post_list_by_limit(skip=0, limit=window),
+        )
+
+    async def suggest_posts(self, prefix: str, limit: int = 10) -> list[PostSuggestionInfo] | None:
+        if self._suggest_cache is None:
+            return await self._repository.suggest_posts(prefix=prefix, limit=limit)
+
+        try:
+            return await self._suggest_cache.get_or_load(
+                (prefix, limit),
+                lambda: _uncached_if_none(self._repository.suggest_posts(prefix=prefix, limit=limit)),
+            )
+        except _UncachedResult:
+            return None
+
+    async def create_post(self, post_id: str, title: str, text: str, user_id: str) -> FullPostInfo | None:
+        result = await self._repository.create_post(post_id, title, text, user_id)
+        self._invalidate_after_commit(post_id)
+        # Новые посты создаются черновиками и в ленту не попадают.
+        if result is None or result.is_published:
+            self._invalidate_feed_after_commit()
+        return result
+
+    async def bulk_create_posts(
+            self,
+            posts: Iterable[PostImportInfo] | AsyncIterable[PostImportInfo],
+            chunk_size: int = 5000,
+            on_progress: Callable[[BulkImportInfo], Any] | None = None,
+    ) -> BulkImportInfo | None:
+        summary = _ImportSummary()
+        result = await self._repository.bulk_create_posts(_summarize_import(posts, summary), chunk_size, on_progress)
+        # Промахи по заданным заранее id могли закэшироваться; импорт редок, проще сбросить всё.
+        if summary.explicit_ids:
+            self._tm.after_commit(self._cache.clear)
+        if summary.published:
+            self._invalidate_feed_after_commit()
+        return result
+
+    async def delete_post(self, post_id: str, author_id: str) -> OutcomeMsgInfo | None:
+        result = await self._repository.delete_post(post_id=post_id, author_id=author_id)
+        self._invalidate_after_commit(post_id)
+        self._invalidate_feed_after_commit()
+        return result
+
+    async def update_post(self, post_id: str, author_id: str, text: str) -> PostInfo | None:
+        result = await self._repository.update_post(post_id=post_id, author_id=author_id, text=text)
+        self._invalidate_after_commit(post_id)
+        if result is None or result.is_published:
+            self._invalidate_feed_after_commit()
+        return result
+
+    async def restore_post(self, post_id: str, author_id: str) -> FullPostInfo | None:
+        result = await self._repository.restore_post(post_id=post_id, author_id=author_id)
+        self._invalidate_after_commit(post_id)
+        if result is None or result.is_published:
+            self._invalidate_feed_after_commit()
+        return result
+
+
+class CachedAuthorRepository:
+    """Репозиторий авторов с read-through кэшем get_author_by_id."""
+
+    def __init__(
+            self,
+            repository: IAuthorRepository,
+            tm: ITransactionManager,
+            cache: TTLCache,
+            suggest_cache: TTLCache | None = None,
+    ):
+        self._repository = repository
+        self._tm = tm
+        self._cache = cache
+        self._suggest_cache = suggest_cache
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._repository, name)
+
+    def _invalidate_after_commit(self, author_id: str) -> None:
+        key = entity_key(author_id)
+        self._tm.after_commit(lambda: self._cache.invalidate(key))
+
+    async def _load_author(self, author_id: str) -> FullAuthorInfo | None:
+        try:
+            return await _uncached_if_none(self._repository.get_author_by_id(author_id=author_id))
+        except NotFoundInfoException:
+            return None
+
+    async def get_author_by_id(self, author_id: str) -> FullAuthorInfo | None:
+        try:
+            author = await self._cache.get_or_load(entity_key(author_id), lambda: self._load_author(author_id))
+        except _UncachedResult:
+            return None
+
+        if author is None:
+            raise NotFoundInfoException("Автор с id %s не найден" % author_id)
+        return author
+
+    async def suggest_authors(self, prefix: str, limit: int = 10) -> list[AuthorSuggestionInfo] | None:
+        if self._suggest_cache is None:
+            return await self._repository.suggest_authors(prefix=prefix, limit=limit)
+
+        try:
+            return await self._suggest_cache.get_or_load(
+                (prefix, limit),
+                lambda: _uncached_if_none(self._repository.suggest_authors(prefix=prefix, limit=limit)),
+            )
+        except _UncachedResult:
+            return None
+
+    async def create_author(self, author_id: str, name: str, email: str, hashed_password: str) -> FullAuthorInfo | None:
+        result = await self._repository.create_author(
+            author_id=author_id,
+            name=name,
+            email=email,
+            hashed_password=hashed_password,
+        )
+        self._invalidate_after_commit(author_id)
+        return result
+
+    async def bulk_create_authors(
+            self,
+            authors: Iterable[AuthorImportInfo] | AsyncIterable[AuthorImportInfo],
+            chunk_size: int = 5000,
+            on_progress: Callable[[BulkImportInfo], Any] | None = None,
+    ) -> BulkImportInfo | None:
+        summary = _ImportSummary()
+        result = await self._repository.bulk_create_authors(_summarize_import(authors, summary), chunk_size, on_progress)
+        if summary.explicit_ids:
+            self._tm.after_commit(self._cache.clear)
+        return result
+
+    async def delete_author(self, author_id: str) -> OutcomeMsgInfo | None:
+        result = await self._repository.delete_author(author_id=author_id)
+        self._invalidate_after_commit(author_id)
+        return result
+
+    async def change_password(self, author_id: str, hashed_password: str) -> OutcomeMsgInfo | None:
+        result = await self._repository.change_password(author_id=author_id, hashed_password=hashed_password)
+        self._invalidate_after_commit(author_id)
+        return result
@@ -0,0 +1,70 @@
+"""Счётчики строк для итогов в постраничных списках.
+
+Значения меняются теми же запросами и в той же транзакции, что и
+данные, поэтому итоги точны без COUNT(*). Имена счётчиков:
+posts:published — опубликованные неудалённые посты (лента),
+posts:author:<uuid> — неудалённые посты автора, authors — все авторы.
+"""
+import uuid
+from typing import Any
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.models import Counter
+
+PUBLISHED_POSTS = 'posts:published'
+AUTHORS = 'authors'
+
+
+def author_posts(author_id: Any) -> str:
+    return f'posts:author:{uuid.UUID(f"{author_id}")}'
+
+
+async def bump_counters(session: AsyncSession, deltas: dict[str, int]) -> None:
+    """Прибавляет deltas к счётчикам, создавая отсутствующие."""
+    # Постоянный порядок имён не даёт конкурентным транзакциям взаимно заблокироваться.
+    values = [{'name': name, 'value': delta} for name, delta in sorted(deltas.items()) if delta]
+    if not values:
+        return
+
+    stmt = insert(Counter).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Counter.name],
+        set_={'value': Counter.value + stmt.excluded.value},
+    )
+    await session.execute(stmt)
+
+
+async def read_counter(session: AsyncSession, name: str) -> int:
+    result = await session.execute(select(Counter.value).where(Counter.name == name))
+    return result.scalar() or 0
+
+
+async def estimate_rows(session: AsyncSession, table: str) -> int | None:
+    """Оценка числа строк по статистике планировщика; None, если таблица ещё не анализировалась."""
+    result = await session.execute(
+        text('SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)'),
+        {'table': table},
+    )
+    estimate = result.scalar()
+    return estimate if estimate is not None and estimate >= 0 else None
+
+
+async def rebuild_counters(session: AsyncSession) -> None:
+    """Пересчитывает все счётчики по данным, например после загрузки в обход репозиториев.
+
+    Запись в posts и authors на время пересчёта нужно остановить.
+    """
+    await session.execute(text('DELETE FROM counters'))
+    await session.execute(text(
+        f"""
+        INSERT INTO counters (name, value)
+        SELECT '{PUBLISHED_POSTS}', count(*) FROM posts WHERE is_published AND NOT is_deleted
+        UNION ALL
+        SELECT '{AUTHORS}', count(*) FROM authors
+        UNION ALL
+        SELECT 'posts:author:' || author_id, count(*) FROM posts WHERE NOT is_deleted GROUP BY author_id
+        """
+    ))
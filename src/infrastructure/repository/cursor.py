@@ -0,0 +1,84 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Iterable, Sequence
+
+from src.application.exceptions.exp_repository import InvalidCursorException
+
+
+def encode_cursor(*values: str) -> str:
+    """Упаковывает значения ключа сортировки в непрозрачный токен."""
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list[str]:
+    """Распаковывает токен, выданный encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        raise InvalidCursorException("Некорректный курсор: %s" % cursor)
+
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+        raise InvalidCursorException("Некорректный курсор: %s" % cursor)
+
+    return values
+
+
+def encode_post_cursor(created_at: datetime, post_id: Any) -> str:
+    return encode_cursor(created_at.isoformat(), f"{post_id}")
+
+
+def decode_post_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    created_at, post_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(created_at), uuid.UUID(post_id)
+    except ValueError:
+        raise InvalidCursorException("Некорректный курсор: %s" % cursor)
+
+
+def encode_search_cursor(rank: float, post_id: Any) -> str:
+    return encode_cursor(repr(rank), f"{post_id}")
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+    rank, post_id = decode_cursor(cursor, 2)
+    try:
+        return float(rank), uuid.UUID(post_id)
+    except ValueError:
+        raise InvalidCursorException("Некорректный курсор: %s" % cursor)
+
+
+def encode_author_cursor(author_id: Any) -> str:
+    return encode_cursor(f"{author_id}")
+
+
+def decode_author_cursor(cursor: str) -> uuid.UUID:
+    author_id, = decode_cursor(cursor, 1)
+    try:
+        return uuid.UUID(author_id)
+    except ValueError:
+        raise InvalidCursorException("Некорректный курсор: %s" % cursor)
+
+
+def parse_uuids(values: Iterable[Any]) -> list[uuid.UUID]:
+    """Приводит идентификаторы к UUID без повторов, отбрасывая некорректные."""
+    result = {}
+    for value in values:
+        try:
+            parsed = uuid.UUID(f"{value}")
+        except ValueError:
+            continue
+        result[parsed] = None
+    return list(result)
+
+
+def split_page(rows: Sequence, limit: int, make_cursor: Callable[[Any], str]) -> tuple[Sequence, str | None]:
+    """Отделяет лишнюю (limit + 1) строку и строит по ней курсор следующей страницы."""
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, make_cursor(rows[-1])
@@ -0,0 +1,128 @@
+"""Объединение одиночных запросов по id в пакетные.
+
+DataLoader создаётся на запрос: все load(), вызванные за один проход цикла
+событий (например, из asyncio.gather), отправляются одним запросом
+get_*_by_ids. Загрузки, поставленные на следующих проходах, пока
+предыдущий пакет ещё выполняется, ждут его на блокировке: AsyncSession не
+допускает параллельных операций, поэтому пакетные запросы одного
+загрузчика идут строго друг за другом.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Hashable, Mapping, TypeVar
+
+from src.application.exceptions.exp_repository import NotFoundInfoException
+from src.application.interfaces.repository.author import IAuthorRepository
+from src.application.interfaces.repository.post import IPostRepository
+from src.entities.author import FullAuthorInfo
+from src.entities.post import FullPostInfo
+from src.infrastructure.repository.cached import entity_key
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class BatchLoadError(Exception):
+    """Пакетный запрос не выполнился; ошибка уже залогирована репозиторием."""
+
+
+class DataLoader(Generic[K, V]):
+    """Собирает ключи, запрошенные за один проход цикла событий, в один пакетный запрос."""
+
+    def __init__(self, batch_load: Callable[[list[K]], Awaitable[Mapping[K, V]]], max_batch_size: int = 500):
+        self._batch_load = batch_load
+        self.max_batch_size = max_batch_size
+        self._queue: dict[K, list[asyncio.Future]] = {}
+        self._lock = asyncio.Lock()
+        # Цикл событий хранит на задачи только слабые ссылки.
+        self._runs: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V | None:
+        loop = asyncio.get_running_loop()
+        if not self._queue:
+            loop.call_soon(self._dispatch)
+
+        future = loop.create_future()
+        self._queue.setdefault(key, []).append(future)
+        return await future
+
+    def _dispatch(self) -> None:
+        queue, self._queue = self._queue, {}
+        task = asyncio.ensure_future(self._run(queue))
+        self._runs.add(task)
+        task.add_done_callback(self._runs.discard)
+
+    async def _run(self, queue: dict[K, list[asyncio.Future]]) -> None:
+        async with self._lock:
+            await self._run_locked(queue)
+
+    async def _run_locked(self, queue: dict[K, list[asyncio.Future]]) -> None:
+        keys = list(queue)
+        try:
+            for start in range(0, len(keys), self.max_batch_size):
+                batch = keys[start:start + self.max_batch_size]
+                values = await self._batch_load(batch)
+                for key in batch:
+                    for future in queue.pop(key):
+                        if not future.done():
+                            future.set_result(values.get(key))
+        except BaseException as e:
+            for futures in queue.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+
+
+class BatchingPostRepository:
+    """Репозиторий постов, пакетирующий конкурентные get_post_by_id."""
+
+    def __init__(self, repository: IPostRepository, max_batch_size: int = 500):
+        self._repository = repository
+        self._loader: DataLoader[Hashable, FullPostInfo] = DataLoader(self._load_posts, max_batch_size)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._repository, name)
+
+    async def _load_posts(self, keys: list[Hashable]) -> dict[Hashable, FullPostInfo]:
+        posts = await self._repository.get_posts_by_ids(post_ids=keys)
+        if posts is None:
+            raise BatchLoadError
+        return {entity_key(post.uuid): post for post in posts}
+
+    async def get_post_by_id(self, post_id: str) -> FullPostInfo | None:
+        try:
+            post = await self._loader.load(entity_key(post_id))
+        except BatchLoadError:
+            return None
+
+        if post is None:
+            raise NotFoundInfoException("Пост с id %s не найден" % post_id)
+        return post
+
+
+class BatchingAuthorRepository:
+    """Репозиторий авторов, пакетирующий конкурентные get_author_by_id."""
+
+    def __init__(self, repository: IAuthorRepository, max_batch_size: int = 500):
+        self._repository = repository
+        self._loader: DataLoader[Hashable, FullAuthorInfo] = DataLoader(self._load_authors, max_batch_size)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._repository, name)
+
+    async def _load_authors(self, keys: list[Hashable]) -> dict[Hashable, FullAuthorInfo]:
+        authors = await self._repository.get_authors_by_ids(author_ids=keys)
+        if authors is None:
+            raise BatchLoadError
+        return {entity_key(author.uuid): author for author in authors}
+
+    async def get_author_by_id(self, author_id: str) -> FullAuthorInfo | None:
+        try:
+            author = await self._loader.load(entity_key(author_id))
+        except BatchLoadError:
+            return None
+
+        if author is None:
+            raise NotFoundInfoException("Автор с id %s не найден" % author_id)
+        return author
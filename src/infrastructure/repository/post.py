@@ -1,20 +1,53 @@
 import logging
+import uuid
+from datetime import datetime, UTC
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable
+
+from asyncpg import PostgresError
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import select, update, delete, insert, func
+from sqlalchemy import select, update, delete, insert, func, tuple_, any_, bindparam, literal, literal_column, Uuid, Float
+from sqlalchemy.dialects.postgresql import ARRAY, REAL
 from sqlalchemy.orm import joinedload
 
-from src.application.exceptions.exp_repository import NotPerformedActionException
-from src.entities.outcome import OutcomeMsgInfo, EntityName, EntityAct
+from src.application.exceptions.exp_repository import (
+    NotFoundInfoException,
+    NotPerformedActionException,
+    StreamInterruptedException,
+)
+from src.entities.outcome import OutcomeMsgInfo, EntityName, EntityAct, BulkImportInfo
 from src.entities.author import AuthorInfo
 from src.application.interfaces.repository.post import IPostRepository
-from src.entities.post import FullPostInfo, PostInfoAuthor, PostInfo
-from src.infrastructure.models import Post
+from src.entities.post import (
+    FullPostInfo,
+    PostInfoAuthor,
+    PostInfo,
+    PostImportInfo,
+    PostFilterInfo,
+    PostSummaryInfo,
+    PostSearchInfo,
+    PostSuggestionInfo,
+    PostViewsInfo,
+)
+from src.entities.page import CursorPage, CountMode
+from src.infrastructure.instrumentation import instrumented
+from src.infrastructure.models import Post, Author, PostArchive, PostView, SEARCH_CONFIG
+from src.infrastructure.repository.bulk import copy_records, iter_chunks
+from src.infrastructure.repository.counters import PUBLISHED_POSTS, author_posts, bump_counters, read_counter
+from src.infrastructure.repository.cursor import (
+    decode_post_cursor,
+    encode_post_cursor,
+    decode_search_cursor,
+    encode_search_cursor,
+    parse_uuids,
+    split_page,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@instrumented
 class PostRepository(IPostRepository):
     """Репозиторий для работы с постами."""
 
@@ -35,7 +68,7 @@ class PostRepository(IPostRepository):
             post = result.scalar_one_or_none()
 
             if not post:
-                return None
+                raise NotFoundInfoException("Пост с id %s не найден" % post_id)
 
             return FullPostInfo(
                 uuid=str(post.uuid),
@@ -49,6 +82,42 @@ class PostRepository(IPostRepository):
         except SQLAlchemyError as e:
             logger.error("Ошибка при получении поста: %s", e)
 
+    async def get_posts_by_ids(self, post_ids: Iterable[str]) -> list[FullPostInfo]:
+        ids = parse_uuids(post_ids)
+        if not ids:
+            return []
+
+        query = select(
+            Post.uuid,
+            Post.title,
+            Post.text,
+            Post.is_published,
+            Post.is_deleted,
+            Post.created_at,
+            Post.author_id,
+        ).where(
+            Post.uuid == any_(bindparam('post_ids', ids, type_=ARRAY(Uuid))),
+            Post.is_deleted == False,
+        )
+
+        try:
+            result = await self._session.execute(query)
+
+            return [
+                FullPostInfo(
+                    uuid=f"{row.uuid}",
+                    title=row.title,
+                    text=row.text,
+                    is_published=row.is_published,
+                    is_deleted=row.is_deleted,
+                    created_at=row.created_at,
+                    author_id=f"{row.author_id}",
+                )
+                for row in result.all()
+            ]
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при получении постов по списку id: %s", e)
+
     async def get_post_list_by_limit(self, skip: int, limit: int) -> list[PostInfoAuthor]:
         query = select(
             Post
@@ -88,7 +157,7 @@ class PostRepository(IPostRepository):
                Post.is_published,
                Post.created_at,
                Post.author_id,
-        ).where(Post.author_id == author_id).offset(skip).limit(limit)
+        ).where(Post.author_id == author_id, Post.is_deleted == False).offset(skip).limit(limit)
 
         try:
             result = await self._session.execute(query)
@@ -107,6 +176,320 @@ class PostRepository(IPostRepository):
         except SQLAlchemyError as e:
             logger.error("Ошибка при получении постов автора: %s", e)
 
+    async def get_post_list_by_cursor(
+            self,
+            cursor: str | None = None,
+            limit: int = 100,
+            count: CountMode | None = None,
+    ) -> CursorPage[PostInfoAuthor]:
+        query = select(
+            Post.uuid,
+            Post.title,
+            Post.text,
+            Post.is_published,
+            Post.created_at,
+            Author.name,
+            Author.email,
+        ).join(
+            Author, Post.author_id == Author.uuid
+        ).where(
+            Post.is_published == True,
+            Post.is_deleted == False,
+        )
+
+        if cursor is not None:
+            query = query.where(tuple_(Post.created_at, Post.uuid) < decode_post_cursor(cursor))
+
+        query = query.order_by(Post.created_at.desc(), Post.uuid.desc()).limit(limit + 1)
+
+        try:
+            result = await self._session.execute(query)
+            rows, next_cursor = split_page(
+                result.all(), limit, lambda row: encode_post_cursor(row.created_at, row.uuid)
+            )
+
+            return CursorPage(
+                items=[
+                    PostInfoAuthor(
+                        title=row.title,
+                        text=row.text,
+                        is_published=row.is_published,
+                        created_at=row.created_at,
+                        author=AuthorInfo(
+                            name=row.name,
+                            email=row.email,
+                        )
+                    )
+                    for row in rows
+                ],
+                next_cursor=next_cursor,
+                total=await read_counter(self._session, PUBLISHED_POSTS) if count else None,
+            )
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при получении опубликованных постов по курсору: %s", e)
+
+    async def get_post_summaries(
+            self,
+            cursor: str | None = None,
+            limit: int = 100,
+            excerpt_length: int = 200,
+            count: CountMode | None = None,
+    ) -> CursorPage[PostSummaryInfo]:
+        # Только нужные колонки и обрезка текста на стороне сервера: строки
+        # не проходят через identity map и не тянут полный text.
+        query = select(
+            Post.uuid,
+            Post.title,
+            func.left(Post.text, excerpt_length),
+            Post.created_at,
+            Author.name,
+        ).join(
+            Author, Post.author_id == Author.uuid
+        ).where(
+            Post.is_published == True,
+            Post.is_deleted == False,
+        )
+
+        if cursor is not None:
+            query = query.where(tuple_(Post.created_at, Post.uuid) < decode_post_cursor(cursor))
+
+        query = query.order_by(Post.created_at.desc(), Post.uuid.desc()).limit(limit + 1)
+
+        try:
+            result = await self._session.execute(query)
+            rows, next_cursor = split_page(
+                result.tuples().all(), limit, lambda row: encode_post_cursor(row[3], row[0])
+            )
+
+            return CursorPage(
+                items=[
+                    PostSummaryInfo(
+                        uuid=f"{post_uuid}",
+                        title=title,
+                        excerpt=excerpt,
+                        created_at=created_at,
+                        author_name=author_name,
+                    )
+                    for post_uuid, title, excerpt, created_at, author_name in rows
+                ],
+                next_cursor=next_cursor,
+                total=await read_counter(self._session, PUBLISHED_POSTS) if count else None,
+            )
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при получении кратких описаний постов: %s", e)
+
+    async def search_posts(
+            self,
+            search_query: str,
+            cursor: str | None = None,
+            limit: int = 20,
+    ) -> CursorPage[PostSearchInfo]:
+        config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+        ts_query = func.websearch_to_tsquery(config, search_query)
+        rank = func.ts_rank_cd(Post.search_vector, ts_query, type_=REAL)
+        headline = func.ts_headline(
+            config,
+            Post.text,
+            ts_query,
+            'StartSel=<b>, StopSel=</b>, MaxFragments=2, MaxWords=30, MinWords=10',
+        )
+
+        query = select(
+            Post.uuid,
+            Post.title,
+            headline.label('headline'),
+            rank.label('rank'),
+            Post.created_at,
+            Post.author_id,
+        ).where(
+            Post.search_vector.bool_op('@@')(ts_query),
+            Post.is_published == True,
+            Post.is_deleted == False,
+        )
+
+        if cursor is not None:
+            query = query.where(tuple_(rank, Post.uuid) < decode_search_cursor(cursor))
+
+        query = query.order_by(rank.desc(), Post.uuid.desc()).limit(limit + 1)
+
+        try:
+            result = await self._session.execute(query)
+            rows, next_cursor = split_page(
+                result.all(), limit, lambda row: encode_search_cursor(row.rank, row.uuid)
+            )
+
+            return CursorPage(
+                items=[
+                    PostSearchInfo(
+                        uuid=f"{row.uuid}",
+                        title=row.title,
+                        headline=row.headline,
+                        rank=row.rank,
+                        created_at=row.created_at,
+                        author_id=f"{row.author_id}",
+                    )
+                    for row in rows
+                ],
+                next_cursor=next_cursor,
+            )
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при полнотекстовом поиске постов: %s", e)
+
+    async def suggest_posts(self, prefix: str, limit: int = 10) -> list[PostSuggestionInfo]:
+        # <% и <<-> сравнивают строку с наиболее похожим фрагментом заголовка,
+        # а GiST-индекс отдаёт ближайших соседей без сортировки всех совпадений.
+        term = literal(prefix)
+        distance = term.op('<<->', return_type=Float)(Post.title)
+        query = select(
+            Post.uuid,
+            Post.title,
+            distance.label('distance'),
+        ).where(
+            term.bool_op('<%')(Post.title),
+            Post.is_published == True,
+            Post.is_deleted == False,
+        ).order_by(distance).limit(limit)
+
+        try:
+            result = await self._session.execute(query)
+
+            return [
+                PostSuggestionInfo(
+                    uuid=f"{row.uuid}",
+                    title=row.title,
+                    score=1 - row.distance,
+                )
+                for row in result.all()
+            ]
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при подборе подсказок по заголовкам постов: %s", e)
+
+    async def get_most_viewed_posts(self, limit: int = 10) -> list[PostViewsInfo]:
+        # Обход ix_post_views_views по убыванию останавливается после limit видимых постов.
+        query = select(
+            Post.uuid,
+            Post.title,
+            PostView.views,
+        ).join(Post, Post.uuid == PostView.post_id).where(
+            Post.is_published == True,
+            Post.is_deleted == False,
+        ).order_by(PostView.views.desc()).limit(limit)
+
+        try:
+            result = await self._session.execute(query)
+
+            return [
+                PostViewsInfo(
+                    uuid=f"{row.uuid}",
+                    title=row.title,
+                    views=row.views,
+                )
+                for row in result.all()
+            ]
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при совершении запроса на получение самых просматриваемых постов: %s", e)
+
+    async def get_posts_by_author_by_cursor(
+            self,
+            author_id: str,
+            cursor: str | None = None,
+            limit: int = 100,
+            count: CountMode | None = None,
+    ) -> CursorPage[PostInfo]:
+        query = select(
+            Post.uuid,
+            Post.title,
+            Post.text,
+            Post.is_published,
+            Post.created_at,
+            Post.author_id,
+        ).where(Post.author_id == author_id, Post.is_deleted == False)
+
+        if cursor is not None:
+            query = query.where(tuple_(Post.created_at, Post.uuid) < decode_post_cursor(cursor))
+
+        query = query.order_by(Post.created_at.desc(), Post.uuid.desc()).limit(limit + 1)
+
+        try:
+            result = await self._session.execute(query)
+            rows, next_cursor = split_page(
+                result.all(), limit, lambda row: encode_post_cursor(row.created_at, row.uuid)
+            )
+
+            return CursorPage(
+                items=[
+                    PostInfo(
+                        title=row.title,
+                        text=row.text,
+                        is_published=row.is_published,
+                        created_at=row.created_at,
+                        author_id=f"{row.author_id}",
+                    )
+                    for row in rows
+                ],
+                next_cursor=next_cursor,
+                total=await read_counter(self._session, author_posts(author_id)) if count else None,
+            )
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при получении постов автора по курсору: %s", e)
+
+    async def count_published_posts(self) -> int | None:
+        try:
+            return await read_counter(self._session, PUBLISHED_POSTS)
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при получении числа опубликованных постов: %s", e)
+
+    async def count_posts_by_author(self, author_id: str) -> int | None:
+        try:
+            return await read_counter(self._session, author_posts(author_id))
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при получении числа постов автора: %s", e)
+
+    async def stream_posts(
+            self,
+            filters: PostFilterInfo | None = None,
+            batch_size: int = 1000,
+    ) -> AsyncIterator[FullPostInfo]:
+        filters = filters or PostFilterInfo()
+        query = select(
+            Post.uuid,
+            Post.title,
+            Post.text,
+            Post.is_published,
+            Post.is_deleted,
+            Post.created_at,
+            Post.author_id,
+        ).execution_options(yield_per=batch_size)
+
+        if filters.author_id is not None:
+            query = query.where(Post.author_id == filters.author_id)
+        if filters.is_published is not None:
+            query = query.where(Post.is_published == filters.is_published)
+        if filters.created_from is not None:
+            query = query.where(Post.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            query = query.where(Post.created_at < filters.created_to)
+        if not filters.include_deleted:
+            query = query.where(Post.is_deleted == False)
+
+        try:
+            result = await self._session.stream(query)
+            async for row in result:
+                yield FullPostInfo(
+                    uuid=f"{row.uuid}",
+                    title=row.title,
+                    text=row.text,
+                    is_published=row.is_published,
+                    is_deleted=row.is_deleted,
+                    created_at=row.created_at,
+                    author_id=f"{row.author_id}",
+                )
+        except SQLAlchemyError as e:
+            # Часть записей уже отдана потребителю: молча завершить поток
+            # значило бы выдать обрезанную выгрузку за полную.
+            logger.error("Ошибка при потоковой выгрузке постов: %s", e)
+            raise StreamInterruptedException("Потоковая выгрузка постов прервана: %s" % e) from e
+
     async def create_post(self, post_id: str, title: str, text: str, author_id: str) -> FullPostInfo | None:
         try:
             stmt = insert(Post).values(author_id=author_id, text=text, id=post_id).returning(
@@ -125,6 +508,11 @@ class PostRepository(IPostRepository):
             if new_post_data is None:
                 raise NotPerformedActionException("Пост не был создан.")
 
+            await bump_counters(self._session, {
+                author_posts(new_post_data.author_id): 1,
+                PUBLISHED_POSTS: int(new_post_data.is_published and not new_post_data.is_deleted),
+            })
+
             return FullPostInfo(
                 uuid=f"{new_post_data.uuid}",
                 title=new_post_data.title,
@@ -137,23 +525,208 @@ class PostRepository(IPostRepository):
         except SQLAlchemyError as e:
             logger.error("Ошибка при создании поста: %s", e)
 
+    async def bulk_create_posts(
+            self,
+            posts: Iterable[PostImportInfo] | AsyncIterable[PostImportInfo],
+            chunk_size: int = 5000,
+            on_progress: Callable[[BulkImportInfo], Any] | None = None,
+    ) -> BulkImportInfo | None:
+        columns = ('uuid', 'title', 'text', 'is_published', 'is_deleted', 'created_at', 'deleted_at', 'author_id')
+        report = BulkImportInfo(entity_name=EntityName.post.value)
+
+        try:
+            async for chunk in iter_chunks(posts, chunk_size):
+                author_ids = parse_uuids({post.author_id for post in chunk})
+                result = await self._session.execute(
+                    select(Author.uuid).where(Author.uuid == any_(bindparam('author_ids', author_ids, type_=ARRAY(Uuid))))
+                )
+                known_authors = set(result.scalars().all())
+                now = datetime.now(tz=UTC).replace(tzinfo=None)
+
+                rows = []
+                deltas: dict[str, int] = {}
+                for post in chunk:
+                    try:
+                        author_id = uuid.UUID(f"{post.author_id}")
+                    except ValueError:
+                        author_id = None
+
+                    try:
+                        post_id = uuid.UUID(f"{post.uuid}") if post.uuid else uuid.uuid4()
+                    except ValueError:
+                        post_id = None
+
+                    if author_id not in known_authors or post_id is None:
+                        report.rejected += 1
+                        continue
+
+                    rows.append((
+                        post_id,
+                        post.title,
+                        post.text,
+                        post.is_published,
+                        post.is_deleted,
+                        post.created_at or now,
+                        # Срок хранения импортированных удалённых постов отсчитывается от импорта.
+                        now if post.is_deleted else None,
+                        author_id,
+                    ))
+
+                    if post.is_deleted:
+                        continue
+                    counter = author_posts(author_id)
+                    deltas[counter] = deltas.get(counter, 0) + 1
+                    if post.is_published:
+                        deltas[PUBLISHED_POSTS] = deltas.get(PUBLISHED_POSTS, 0) + 1
+
+                if rows:
+                    await copy_records(self._session, Post.__tablename__, columns, rows)
+                    await bump_counters(self._session, deltas)
+
+                report.chunks += 1
+                report.inserted += len(rows)
+                if on_progress is not None:
+                    on_progress(report)
+
+            return report
+        except (SQLAlchemyError, PostgresError) as e:
+            logger.error("Ошибка при массовой загрузке постов: %s", e)
+
     async def delete_post(self, post_id: str, author_id: str) -> OutcomeMsgInfo | None:
+        """Помечает пост удалённым; в архив его позже переносит PostArchiver."""
         try:
-            stmt = delete(Post).where((Post.uuid == post_id) & (Post.author_id == author_id)).returning(Post.uuid)
+            stmt = (
+                update(Post)
+                .where(
+                    (Post.uuid == post_id) &
+                    (Post.author_id == author_id) &
+                    (Post.is_deleted == False)
+                )
+                .values(is_deleted=True, deleted_at=datetime.now(tz=UTC).replace(tzinfo=None))
+                .returning(
+                    Post.uuid,
+                    Post.author_id,
+                    Post.is_published,
+                )
+            )
             result = await self._session.execute(stmt)
-            del_post_id = result.scalar()
+            deleted_post = result.fetchone()
 
-            if del_post_id is None:
+            if deleted_post is None:
                 raise NotPerformedActionException("Пост не был удален: %s" % author_id)
 
+            await bump_counters(self._session, {
+                author_posts(deleted_post.author_id): -1,
+                PUBLISHED_POSTS: -int(deleted_post.is_published),
+            })
+
             return OutcomeMsgInfo(
-                entity_id=f"{del_post_id}",
+                entity_id=f"{deleted_post.uuid}",
                 entity_name=EntityName.post.value,
                 entity_act=EntityAct.delete.value,
             )
         except SQLAlchemyError as e:
             logger.error("Ошибка при совершении запроса на удаление поста: %s", e)
 
+    async def get_archived_post(self, post_id: str) -> FullPostInfo | None:
+        query = select(PostArchive).where(PostArchive.uuid == post_id)
+
+        try:
+            result = await self._session.execute(query)
+            post = result.scalar_one_or_none()
+
+            if not post:
+                return None
+
+            return FullPostInfo(
+                uuid=f"{post.uuid}",
+                title=post.title,
+                text=post.text,
+                is_published=post.is_published,
+                is_deleted=True,
+                created_at=post.created_at,
+                author_id=f"{post.author_id}",
+            )
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при получении архивного поста: %s", e)
+
+    async def restore_post(self, post_id: str, author_id: str) -> FullPostInfo | None:
+        """Снимает с поста пометку удаления; уже архивный пост возвращается в posts."""
+        try:
+            stmt = (
+                update(Post)
+                .where(
+                    (Post.uuid == post_id) &
+                    (Post.author_id == author_id) &
+                    (Post.is_deleted == True)
+                )
+                .values(is_deleted=False, deleted_at=None)
+                .returning(
+                    Post.uuid,
+                    Post.title,
+                    Post.text,
+                    Post.is_published,
+                    Post.created_at,
+                    Post.author_id,
+                )
+            )
+            result = await self._session.execute(stmt)
+            restored_post = result.fetchone()
+
+            if restored_post is None:
+                restored_post = await self._restore_archived_post(post_id, author_id)
+
+            await bump_counters(self._session, {
+                author_posts(restored_post.author_id): 1,
+                PUBLISHED_POSTS: int(restored_post.is_published),
+            })
+
+            return FullPostInfo(
+                uuid=f"{restored_post.uuid}",
+                title=restored_post.title,
+                text=restored_post.text,
+                is_published=restored_post.is_published,
+                is_deleted=False,
+                created_at=restored_post.created_at,
+                author_id=f"{restored_post.author_id}",
+            )
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при восстановлении поста %s: %s", post_id, e)
+
+    async def _restore_archived_post(self, post_id: str, author_id: str) -> Any:
+        """Переносит пост из архива обратно в posts вместе с просмотрами."""
+        stmt = delete(PostArchive).where(
+            (PostArchive.uuid == post_id) & (PostArchive.author_id == author_id)
+        ).returning(
+            PostArchive.uuid,
+            PostArchive.title,
+            PostArchive.text,
+            PostArchive.is_published,
+            PostArchive.created_at,
+            PostArchive.author_id,
+            PostArchive.views,
+        )
+        result = await self._session.execute(stmt)
+        archived_post = result.fetchone()
+
+        if archived_post is None:
+            raise NotPerformedActionException("Пост не был восстановлен из архива: %s" % post_id)
+
+        await self._session.execute(insert(Post).values(
+            uuid=archived_post.uuid,
+            title=archived_post.title,
+            text=archived_post.text,
+            is_published=archived_post.is_published,
+            is_deleted=False,
+            created_at=archived_post.created_at,
+            author_id=archived_post.author_id,
+        ))
+        if archived_post.views:
+            await self._session.execute(
+                insert(PostView).values(post_id=archived_post.uuid, views=archived_post.views)
+            )
+        return archived_post
+
     async def update_post(self, post_id: str, author_id: str, text: str) -> PostInfo | None:
         try:
             stmt = (
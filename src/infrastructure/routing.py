@@ -0,0 +1,64 @@
+"""Разделение чтения и записи между primary и репликами.
+
+RoutingSession отправляет обычные SELECT на реплику, выбранную один раз
+на сессию, а всё остальное (DML, SELECT ... FOR UPDATE, текстовые
+запросы, flush) — на primary. После первого такого запроса сессия до
+закрытия работает только с primary, поэтому чтения после записи в
+рамках одного запроса видят свои изменения, несмотря на отставание реплик.
+"""
+import itertools
+from typing import Any, Literal
+
+from sqlalchemy import Engine, Select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+
+class ReplicaSet:
+    """Набор движков реплик с выбором по кругу или по наименьшей загрузке пула."""
+
+    def __init__(self, engines: list[AsyncEngine], selection: Literal['round_robin', 'least_busy'] = 'round_robin'):
+        self.engines = engines
+        self.selection = selection
+        self._cycle = itertools.cycle(engines)
+
+    def choose(self) -> Engine:
+        if self.selection == 'least_busy':
+            engine = min(self.engines, key=lambda e: e.sync_engine.pool.checkedout())
+        else:
+            engine = next(self._cycle)
+        return engine.sync_engine
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+class RoutingSession(Session):
+    """Сессия, направляющая чтения на реплики, а запись и последующие чтения — на primary."""
+
+    def __init__(self, *args, replicas: ReplicaSet | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._replicas = replicas
+        self._replica: Engine | None = None
+        self._primary_only = False
+
+    def _is_replica_safe(self, clause: Any) -> bool:
+        return isinstance(clause, Select) and clause._for_update_arg is None
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._replicas is None or self._primary_only:
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        if self._flushing or not self._is_replica_safe(clause):
+            self._primary_only = True
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        if self._replica is None:
+            self._replica = self._replicas.choose()
+        return self._replica
+
+    def close(self) -> None:
+        super().close()
+        self._replica = None
+        self._primary_only = False
@@ -1,16 +1,106 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+import inspect
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
 
 from src.application.interfaces.repository.tm import ITransactionManager
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UnitOfWork:
+    """Состояние одной единицы работы или точки сохранения внутри неё."""
+
+    savepoint: AsyncSessionTransaction | None = None
+    after_commit: list[Callable[[], Any]] = field(default_factory=list)
+    rollback_only: bool = False
+    rolled_back: bool = False
+
 
 class TransactionManager(ITransactionManager):
-    """Менеджер транзакций"""
+    """Менеджер транзакций
+
+    Внутри unit_of_work() вызовы commit() из сервисов откладываются до выхода
+    из блока, поэтому несколько операций фиксируются одной транзакцией.
+    rollback() внутри блока помечает его rollback-only: при выходе вся
+    единица работы откатывается. Вложенный unit_of_work() открывает точку
+    сохранения, и её откат не затрагивает внешний блок, так что неудавшуюся
+    часть можно повторить. Обработчики after_commit, зарегистрированные в
+    откаченной точке сохранения, отбрасываются, а остальные выполняются
+    только после фиксации всей транзакции.
+    """
 
     def __init__(self, session: AsyncSession):
         self._session = session
+        self._after_commit: list[Callable[[], Any]] = []
+        self._units: list[UnitOfWork] = []
 
     async def commit(self) -> None:
+        if self._units:
+            return
+
         await self._session.commit()
 
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                result = callback()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error("Ошибка в обработчике после фиксации транзакции: %s", e)
+
     async def rollback(self) -> None:
+        if self._units:
+            self._units[-1].rollback_only = True
+            return
+
+        self._after_commit.clear()
         await self._session.rollback()
+
+    def after_commit(self, callback: Callable[[], Any]) -> None:
+        """Откладывает вызов callback до успешной фиксации текущей транзакции."""
+        if self._units:
+            self._units[-1].after_commit.append(callback)
+        else:
+            self._after_commit.append(callback)
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[UnitOfWork]:
+        """Группирует операции сервисов в одну транзакцию или точку сохранения.
+
+        После выхода из блока rolled_back показывает, была ли работа откачена.
+        """
+        unit = UnitOfWork()
+        if self._units:
+            unit.savepoint = await self._session.begin_nested()
+        self._units.append(unit)
+
+        try:
+            yield unit
+        except BaseException:
+            self._units.pop()
+            await self._discard(unit)
+            raise
+
+        self._units.pop()
+        if unit.rollback_only:
+            await self._discard(unit)
+        elif unit.savepoint is not None:
+            await unit.savepoint.commit()
+            self._units[-1].after_commit.extend(unit.after_commit)
+        else:
+            self._after_commit.extend(unit.after_commit)
+            await self.commit()
+
+    async def _discard(self, unit: UnitOfWork) -> None:
+        unit.rolled_back = True
+        unit.after_commit.clear()
+        if unit.savepoint is not None:
+            await unit.savepoint.rollback()
+        else:
+            await self.rollback()
@@ -0,0 +1,142 @@
+"""Счётчик просмотров постов с агрегацией в памяти.
+
+UPDATE строки posts на каждый просмотр даёт по новой версии строки и
+блокировку на популярных постах. ViewCounter вместо этого копит приращения
+в словаре процесса и раз в flush_interval секунд (или при накоплении
+max_pending разных постов) пишет их одним запросом в post_views.
+
+Границы потерь: при аварийном завершении процесса теряются просмотры,
+накопленные с последней успешной записи. Пока база доступна, это не больше
+flush_interval секунд трафика этого воркера; если перед сбоем база была
+недоступна — все просмотры за время недоступности. При штатной остановке
+close() записывает остаток.
+
+Если запись не удалась, приращения возвращаются в буфер, а следующая
+попытка откладывается с экспоненциальной задержкой от flush_interval до
+max_retry_delay: ни record(), ни периодическая запись не обращаются к
+недоступной базе чаще. Буфер при этом растёт не больше чем на число разных
+постов, а не на число просмотров. Просмотры удалённых постов отбрасываются.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter as Tally
+from typing import Any, Callable
+
+from sqlalchemy import BigInteger, Uuid, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.infrastructure.models import Post, PostView
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """Буфер просмотров одного воркера с периодической пакетной записью."""
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            flush_interval: float = 5.0,
+            max_pending: int = 10000,
+            max_retry_delay: float = 60.0,
+            timer: Callable[[], float] = time.monotonic,
+    ):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retry_delay = max_retry_delay
+        self._session_maker = session_maker
+        self._timer = timer
+        self._retry_delay = 0.0
+        self._retry_at = 0.0
+        self._pending: Tally[uuid.UUID] = Tally()
+        self._task: asyncio.Task | None = None
+        self._flushing: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return sum(self._pending.values())
+
+    def record(self, post_id: Any, views: int = 1) -> None:
+        """Учитывает просмотр; в базу он попадёт со следующей записью."""
+        self._pending[uuid.UUID(f"{post_id}")] += views
+        if len(self._pending) >= self.max_pending and self._flushing is None and self._can_retry():
+            self._flushing = asyncio.get_running_loop().create_task(self._flush_in_background())
+
+    def _can_retry(self) -> bool:
+        return self._timer() >= self._retry_at
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._flushing is not None:
+            await self._flushing
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._can_retry():
+                await self.flush()
+
+    async def _flush_in_background(self) -> None:
+        try:
+            await self.flush()
+        finally:
+            self._flushing = None
+
+    async def flush(self) -> int:
+        """Записывает накопленные просмотры; возвращает число записанных."""
+        if not self._pending:
+            return 0
+
+        batch, self._pending = self._pending, Tally()
+        # Постоянный порядок строк не даёт двум воркерам взаимно заблокироваться.
+        post_ids = sorted(batch)
+        views = [batch[post_id] for post_id in post_ids]
+
+        increments = select(
+            func.unnest(bindparam('post_ids', post_ids, type_=ARRAY(Uuid))).label('post_id'),
+            func.unnest(bindparam('views', views, type_=ARRAY(BigInteger))).label('views'),
+        ).subquery()
+        # Соединение с posts отбрасывает просмотры постов, удалённых до записи.
+        stmt = insert(PostView).from_select(
+            ['post_id', 'views'],
+            select(increments.c.post_id, increments.c.views)
+            .join(Post, Post.uuid == increments.c.post_id)
+            .order_by(increments.c.post_id),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PostView.post_id],
+            set_={'views': PostView.views + stmt.excluded.views},
+        )
+
+        try:
+            async with self._session_maker() as session:
+                await session.execute(stmt)
+                await session.commit()
+        except Exception as e:
+            batch.update(self._pending)
+            self._pending = batch
+            self._retry_delay = min(max(self._retry_delay * 2, self.flush_interval), self.max_retry_delay)
+            self._retry_at = self._timer() + self._retry_delay
+            logger.error(
+                "Ошибка при записи просмотров постов, %s постов ждут повтора через %.0f с: %s",
+                len(batch), self._retry_delay, e,
+            )
+            return 0
+
+        self._retry_delay = 0.0
+        self._retry_at = 0.0
+        return sum(views)
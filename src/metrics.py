@@ -0,0 +1,241 @@
+"""Метрики процесса в формате Prometheus.
+
+Реестр живёт в памяти процесса и по умолчанию выключен: пока
+registry.enabled ложно, обёртки @timed сводятся к одной проверке флага, а
+гистограммы и счётчики не обновляются. Значения датчиков (gauge)
+вычисляются функциями обратного вызова только при выгрузке render(),
+поэтому глубина очереди bcrypt, доля попаданий в кэш и состояние пула
+соединений ничего не стоят между выгрузками.
+"""
+import bisect
+import functools
+import inspect
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Iterable, Mapping, TypeVar
+
+T = TypeVar('T')
+
+Labels = tuple[tuple[str, str], ...]
+GaugeCallback = Callable[[], float | Mapping[Labels, float]]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def labels(**values: Any) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in values.items()))
+
+
+def _format_labels(label_pairs: Labels, extra: Labels = ()) -> str:
+    pairs = label_pairs + extra
+    if not pairs:
+        return ''
+    escaped = (
+        '%s="%s"' % (name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{%s}' % ','.join(escaped)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+class CounterMetric:
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values: dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_pairs: Labels = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_pairs] = self._values.get(label_pairs, 0.0) + amount
+
+    def value(self, label_pairs: Labels = ()) -> float:
+        return self._values.get(label_pairs, 0.0)
+
+    def render(self) -> Iterable[str]:
+        yield '# HELP %s %s' % (self.name, self.documentation)
+        yield '# TYPE %s counter' % self.name
+        for label_pairs, value in sorted(self._values.items()):
+            yield '%s%s %s' % (self.name, _format_labels(label_pairs), _format_value(value))
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # По каждому набору меток: счётчики корзин, сумма, количество.
+        self._values: dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, label_pairs: Labels = ()) -> None:
+        with self._lock:
+            state = self._values.get(label_pairs)
+            if state is None:
+                state = self._values[label_pairs] = [[0] * len(self.buckets), 0.0, 0]
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, label_pairs: Labels = ()) -> int:
+        state = self._values.get(label_pairs)
+        return state[2] if state else 0
+
+    def render(self) -> Iterable[str]:
+        yield '# HELP %s %s' % (self.name, self.documentation)
+        yield '# TYPE %s histogram' % self.name
+        for label_pairs, (bucket_counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                yield '%s_bucket%s %d' % (
+                    self.name, _format_labels(label_pairs, (('le', _format_value(bound)),)), cumulative,
+                )
+            yield '%s_sum%s %s' % (self.name, _format_labels(label_pairs), _format_value(total))
+            yield '%s_count%s %d' % (self.name, _format_labels(label_pairs), count)
+
+
+class Gauge:
+    """Значение, вычисляемое при выгрузке; metric_type='counter' для накопительных величин."""
+
+    def __init__(self, name: str, documentation: str, callback: GaugeCallback, metric_type: str = 'gauge'):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.metric_type = metric_type
+
+    def render(self) -> Iterable[str]:
+        value = self.callback()
+        values = value if isinstance(value, Mapping) else {(): value}
+        yield '# HELP %s %s' % (self.name, self.documentation)
+        yield '# TYPE %s %s' % (self.name, self.metric_type)
+        for label_pairs, sample in sorted(values.items()):
+            yield '%s%s %s' % (self.name, _format_labels(label_pairs), _format_value(sample))
+
+
+class Registry:
+    def __init__(self):
+        self.enabled = False
+        self._metrics: dict[str, CounterMetric | Histogram | Gauge] = {}
+
+    def counter(self, name: str, documentation: str) -> CounterMetric:
+        return self._register(name, lambda: CounterMetric(name, documentation))
+
+    def histogram(self, name: str, documentation: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(name, lambda: Histogram(name, documentation, buckets))
+
+    def gauge(self, name: str, documentation: str, callback: GaugeCallback, metric_type: str = 'gauge') -> Gauge:
+        """Регистрирует датчик; повторная регистрация с тем же именем заменяет callback."""
+        gauge = Gauge(name, documentation, callback, metric_type)
+        self._metrics[name] = gauge
+        return gauge
+
+    def _register(self, name: str, factory: Callable[[], Any]) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = factory()
+        return metric
+
+    def render(self) -> str:
+        """Все метрики в текстовом формате Prometheus 0.0.4."""
+        lines = []
+        for name in sorted(self._metrics):
+            try:
+                lines.extend(self._metrics[name].render())
+            except Exception as e:
+                logging.getLogger(__name__).error("Ошибка при вычислении метрики %s: %s", name, e)
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+service_latency = registry.histogram(
+    'service_method_duration_seconds', 'Длительность вызовов методов сервисов.',
+)
+service_errors = registry.counter(
+    'service_method_errors_total', 'Ошибки, которые сервисы и репозитории перехватили и записали в лог.',
+)
+service_exceptions = registry.counter(
+    'service_method_exceptions_total', 'Исключения, вышедшие из методов сервисов.',
+)
+
+
+def enable_metrics() -> None:
+    """Включает сбор метрик и подсчёт ошибок, которые код только пишет в лог."""
+    registry.enabled = True
+    # Репозитории перехватывают SQLAlchemyError сами, поэтому обработчик
+    # висит на корневом логгере приложения, а не только на сервисах.
+    app_logger = logging.getLogger('src')
+    if not any(isinstance(handler, ErrorMetricsHandler) for handler in app_logger.handlers):
+        app_logger.addHandler(ErrorMetricsHandler())
+
+
+def disable_metrics() -> None:
+    registry.enabled = False
+
+
+class ErrorMetricsHandler(logging.Handler):
+    """Считает записи ERROR модулей src: сервисы и репозитории ловят ошибки и только логируют их.
+
+    Метка layer — пакет модуля (services, repository, ...), service — сам модуль.
+    """
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if registry.enabled:
+            layer, _, service = record.name.rpartition('.')
+            service_errors.inc(labels(layer=layer.rpartition('.')[2], service=service, method=record.funcName))
+
+
+def _timed_method(service: str, name: str, method: Callable) -> Callable:
+    label_pairs = labels(service=service, method=name)
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return await method(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            except Exception:
+                service_exceptions.inc(label_pairs)
+                raise
+            finally:
+                service_latency.observe(time.perf_counter() - started, label_pairs)
+        return wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if not registry.enabled:
+            return method(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        except Exception:
+            service_exceptions.inc(label_pairs)
+            raise
+        finally:
+            service_latency.observe(time.perf_counter() - started, label_pairs)
+    return wrapper
+
+
+def timed(cls: type[T]) -> type[T]:
+    """Декоратор класса: гистограмма длительности и счётчик исключений публичных методов."""
+    module = cls.__module__.rpartition('.')[2]
+    for attribute, method in list(vars(cls).items()):
+        if attribute.startswith('_') or not inspect.isfunction(method):
+            continue
+        if inspect.isasyncgenfunction(method):
+            continue
+        setattr(cls, attribute, _timed_method(module, attribute, method))
+    return cls
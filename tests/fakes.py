@@ -0,0 +1,39 @@
+"""Сессия SQLAlchemy в памяти: записывает commit, rollback и точки сохранения."""
+
+
+class Savepoint:
+    def __init__(self, session, number):
+        self._session = session
+        self._number = number
+
+    async def commit(self):
+        self._session.events.append('release %d' % self._number)
+
+    async def rollback(self):
+        self._session.events.append('rollback to %d' % self._number)
+
+
+class Session:
+    def __init__(self, fail_commit: Exception | None = None):
+        self.events = []
+        self.fail_commit = fail_commit
+        self._savepoints = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def begin_nested(self):
+        self._savepoints += 1
+        self.events.append('savepoint %d' % self._savepoints)
+        return Savepoint(self, self._savepoints)
+
+    async def commit(self):
+        if self.fail_commit is not None:
+            raise self.fail_commit
+        self.events.append('commit')
+
+    async def rollback(self):
+        self.events.append('rollback')
@@ -0,0 +1,128 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.application.exceptions.exp_service import InvalidRefreshToken, RevokedAccessToken
+from src.application.services import auth
+from src.application.services.auth import AuthService
+from src.application.services.author import AuthorService
+from src.entities.author import FullAuthorInfo
+from src.entities.outcome import OutcomeMsgInfo
+
+AUTHOR = FullAuthorInfo(uuid='6f1d3b9e-3f4c-4b8e-9a55-0c2d7c1e8a10', name='Анна Иванова', email='anna@example.com')
+
+
+@pytest.fixture(autouse=True)
+def auth_settings(monkeypatch):
+    settings = SimpleNamespace(
+        SECRET_KEY='test-secret-key-of-at-least-32-bytes',
+        ALGORITHM='HS256',
+        TOKEN_CACHE_SIZE=100,
+        BCRYPT_ROUNDS=5,
+        HASHING_WORKERS=1,
+        HASHING_QUEUE_LIMIT=10,
+    )
+    monkeypatch.setattr(auth, '_auth_settings', lambda: settings)
+    clear_caches()
+    yield
+    if auth._hashing_pool.cache_info().currsize:
+        auth._hashing_pool().shutdown()
+    clear_caches()
+
+
+def clear_caches():
+    for cache in (auth._token_cache, auth._hasher, auth._hashing_pool):
+        cache.cache_clear()
+
+
+class AuthorRepository:
+    def __init__(self):
+        self.passwords = {}
+
+    async def get_author_by_id(self, author_id):
+        return AUTHOR if author_id == AUTHOR.uuid else None
+
+    async def change_password(self, author_id, hashed_password):
+        self.passwords[author_id] = hashed_password
+        return OutcomeMsgInfo(entity_id=author_id)
+
+
+class TransactionManager:
+    def __init__(self):
+        self._callbacks = []
+
+    def after_commit(self, callback):
+        self._callbacks.append(callback)
+
+    async def commit(self):
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    async def rollback(self):
+        self._callbacks.clear()
+
+
+def change_password(auth_service: AuthService) -> None:
+    author_service = AuthorService(AuthorRepository(), TransactionManager(), auth_service)
+    asyncio.run(author_service.change_password(AUTHOR.uuid, 'new-hash'))
+
+
+def test_change_password_revokes_access_token():
+    auth_service = AuthService()
+    token = auth_service.encode_token(AUTHOR.email)
+    assert auth_service.decode_token(token) == AUTHOR.email
+
+    change_password(auth_service)
+
+    with pytest.raises(RevokedAccessToken):
+        auth_service.decode_token(token)
+
+
+def test_change_password_revokes_refresh_token():
+    auth_service = AuthService()
+    refresh_token = auth_service.encode_refresh_token(AUTHOR.email)
+
+    change_password(auth_service)
+
+    with pytest.raises(InvalidRefreshToken):
+        auth_service.refresh_token(refresh_token)
+
+
+def test_token_issued_after_change_password_is_accepted():
+    auth_service = AuthService()
+    old_token = auth_service.encode_token(AUTHOR.email)
+
+    change_password(auth_service)
+    token = auth_service.encode_token(AUTHOR.email)
+    refresh_token = auth_service.encode_refresh_token(AUTHOR.email)
+
+    with pytest.raises(RevokedAccessToken):
+        auth_service.decode_token(old_token)
+    assert auth_service.decode_token(token) == AUTHOR.email
+    assert auth_service.decode_token(auth_service.refresh_token(refresh_token)) == AUTHOR.email
+
+
+def test_login_with_outdated_bcrypt_cost_keeps_tokens():
+    from passlib.context import CryptContext
+
+    auth_service = AuthService()
+    repository = AuthorRepository()
+    author_service = AuthorService(repository, TransactionManager(), auth_service)
+    outdated_hash = CryptContext(schemes=['bcrypt'], bcrypt__rounds=4).hash('secret')
+    token = auth_service.encode_token(AUTHOR.email)
+
+    async def login():
+        verified, new_hash = await auth_service.verify_password_async('secret', outdated_hash)
+        if verified and new_hash is not None:
+            await author_service.rehash_password(AUTHOR.uuid, new_hash)
+        return verified, new_hash
+
+    verified, new_hash = asyncio.run(login())
+
+    assert verified
+    assert auth_service.hasher.needs_update(outdated_hash)
+    assert not auth_service.hasher.needs_update(new_hash)
+    assert repository.passwords == {AUTHOR.uuid: new_hash}
+    assert auth_service.decode_token(token) == AUTHOR.email
@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.application.exceptions.exp_repository import NotFoundInfoException
+from src.entities.post import FullPostInfo
+from src.infrastructure.cache.ttl import TTLCache
+from src.infrastructure.repository.cached import CachedPostRepository
+
+POST = FullPostInfo(
+    uuid='0b6f3c1e-5d2a-4f7e-8c91-3a4b5c6d7e8f',
+    title='Заголовок',
+    text='Текст',
+    is_published=True,
+    is_deleted=False,
+    created_at=datetime(2024, 1, 1),
+    author_id='6f1d3b9e-3f4c-4b8e-9a55-0c2d7c1e8a10',
+)
+MISSING_ID = '9a8b7c6d-5e4f-4a3b-8c2d-1e0f9a8b7c6d'
+
+
+class PostRepository:
+    def __init__(self, failing: bool = False):
+        self.failing = failing
+        self.calls = 0
+
+    async def get_post_by_id(self, post_id):
+        self.calls += 1
+        if self.failing:
+            return None
+        if post_id != POST.uuid:
+            raise NotFoundInfoException("Пост с id %s не найден" % post_id)
+        return POST
+
+
+def cached(repository: PostRepository) -> CachedPostRepository:
+    return CachedPostRepository(repository, tm=None, cache=TTLCache())
+
+
+def test_post_hit_is_cached():
+    repository = PostRepository()
+    posts = cached(repository)
+
+    assert asyncio.run(posts.get_post_by_id(POST.uuid)) == POST
+    assert asyncio.run(posts.get_post_by_id(POST.uuid.replace('-', ''))) == POST
+    assert repository.calls == 1
+
+
+def test_post_miss_is_cached():
+    repository = PostRepository()
+    posts = cached(repository)
+
+    for _ in range(2):
+        with pytest.raises(NotFoundInfoException):
+            asyncio.run(posts.get_post_by_id(MISSING_ID))
+    assert repository.calls == 1
+
+
+def test_failed_post_query_is_not_cached():
+    repository = PostRepository(failing=True)
+    posts = cached(repository)
+
+    assert asyncio.run(posts.get_post_by_id(POST.uuid)) is None
+    assert asyncio.run(posts.get_post_by_id(POST.uuid)) is None
+    assert repository.calls == 2
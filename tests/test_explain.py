@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from src.infrastructure.explain import check_repository_plans
+
+
+def database_settings():
+    from src.config import settings
+
+    try:
+        return settings().psql_settings
+    except ValidationError:
+        pytest.skip('база данных не настроена (PSQL_SETTINGS__* или .env)')
+
+
+async def repository_plans(psql_settings):
+    from src.infrastructure.database import new_session_maker
+
+    session_maker = new_session_maker(psql_settings)
+    try:
+        try:
+            async with session_maker() as session:
+                await session.execute(text('SELECT 1'))
+        except (OSError, DBAPIError) as e:
+            pytest.skip('база данных недоступна: %s' % e)
+        return await check_repository_plans(session_maker)
+    finally:
+        await session_maker.kw['bind'].dispose()
+
+
+def test_repository_queries_use_indexes():
+    violations = asyncio.run(repository_plans(database_settings()))
+
+    assert not violations, '\n'.join(
+        '%s: %s по таблице %s' % (violation.operation, violation.node_type, violation.relation)
+        for violation in violations
+    )
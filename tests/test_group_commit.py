@@ -0,0 +1,93 @@
+import asyncio
+
+from sqlalchemy.exc import OperationalError
+
+from src.infrastructure.group_commit import GroupCommitter
+from tests.fakes import Session
+
+
+class SessionMaker:
+    def __init__(self, fail_commit: Exception | None = None):
+        self.sessions = []
+        self._fail_commit = fail_commit
+
+    def __call__(self):
+        session = Session(self._fail_commit)
+        self.sessions.append(session)
+        return session
+
+
+async def returns(value, session):
+    return value
+
+
+async def fails(session):
+    raise ValueError('операция не выполнена')
+
+
+def test_failed_operation_rolls_back_only_its_savepoint():
+    session_maker = SessionMaker()
+
+    async def submit_all():
+        committer = GroupCommitter(session_maker, max_batch=3)
+        results = await asyncio.gather(
+            committer.submit(lambda s: returns(1, s)),
+            committer.submit(fails),
+            committer.submit(lambda s: returns(3, s)),
+            return_exceptions=True,
+        )
+        return committer, results
+
+    committer, (first, second, third) = asyncio.run(submit_all())
+
+    assert (first, third) == (1, 3)
+    assert isinstance(second, ValueError)
+    assert [session.events for session in session_maker.sessions] == [[
+        'savepoint 1', 'release 1', 'savepoint 2', 'rollback to 2', 'savepoint 3', 'release 3', 'commit',
+    ]]
+    assert (committer.stats.batches, committer.stats.operations) == (1, 3)
+
+
+def test_failed_commit_fails_every_operation_of_the_batch():
+    error = OperationalError('COMMIT', {}, ConnectionError('connection reset'))
+    session_maker = SessionMaker(fail_commit=error)
+
+    async def submit_all():
+        committer = GroupCommitter(session_maker, max_batch=2)
+        results = await asyncio.gather(
+            committer.submit(lambda s: returns(1, s)),
+            committer.submit(lambda s: returns(2, s)),
+            return_exceptions=True,
+        )
+        return committer, results
+
+    committer, results = asyncio.run(submit_all())
+
+    assert results == [error, error]
+    assert committer.stats.failed_batches == 1
+
+
+def test_cancelled_batch_does_not_leave_callers_waiting():
+    session_maker = SessionMaker()
+
+    async def submit_all():
+        committer = GroupCommitter(session_maker, max_batch=2)
+        started = asyncio.Event()
+
+        async def hangs(session):
+            started.set()
+            await asyncio.Event().wait()
+
+        callers = asyncio.gather(
+            committer.submit(hangs),
+            committer.submit(lambda s: returns(2, s)),
+            return_exceptions=True,
+        )
+        await started.wait()
+        for flush in committer._flushes:
+            flush.cancel()
+        return await asyncio.wait_for(callers, timeout=1)
+
+    results = asyncio.run(submit_all())
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
@@ -0,0 +1,22 @@
+import os
+
+import pytest
+
+from benchmarks.importtime import BUDGET_MS, measure_imports, package_modules, total_ms
+
+# Сервисный слой не должен тянуть их при импорте: они загружаются при первом обращении.
+LAZY_DEPENDENCIES = ('jwt', 'passlib', 'pydantic_settings', 'sqlalchemy')
+
+
+@pytest.mark.skipif(
+    'IMPORTTIME_BUDGET_MS' not in os.environ,
+    reason='проверка по времени включается через IMPORTTIME_BUDGET_MS (пустое значение — BUDGET_MS)',
+)
+def test_import_time_within_budget():
+    budget_ms = float(os.environ['IMPORTTIME_BUDGET_MS'] or BUDGET_MS)
+    assert total_ms(measure_imports(package_modules())) <= budget_ms
+
+
+def test_application_does_not_import_lazy_dependencies():
+    imported = {timing.module.split('.')[0] for timing in measure_imports(package_modules(('src.application',)))}
+    assert imported.isdisjoint(LAZY_DEPENDENCIES)
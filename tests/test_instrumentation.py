@@ -0,0 +1,44 @@
+import asyncio
+
+from src.infrastructure.instrumentation import current_operation, instrumented
+
+
+@instrumented
+class Repository:
+    def __init__(self):
+        self.operations = []
+
+    async def stream(self):
+        try:
+            for number in range(3):
+                self.operations.append(current_operation.get())
+                yield number
+        finally:
+            self.operations.append(current_operation.get())
+
+
+def test_async_generator_sets_operation_only_inside_steps():
+    repository = Repository()
+
+    async def consume():
+        consumer_operations = []
+        async for _ in repository.stream():
+            consumer_operations.append(current_operation.get())
+        return consumer_operations
+
+    assert asyncio.run(consume()) == [None, None, None]
+    assert repository.operations == ['Repository.stream'] * 4
+
+
+def test_async_generator_closed_from_another_context():
+    repository = Repository()
+
+    async def consume():
+        stream = repository.stream()
+        assert await anext(stream) == 0
+        # Задача выполняется в копии контекста, как финализатор цикла.
+        await asyncio.create_task(stream.aclose())
+        return current_operation.get()
+
+    assert asyncio.run(consume()) is None
+    assert repository.operations == ['Repository.stream'] * 2
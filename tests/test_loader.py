@@ -0,0 +1,23 @@
+import asyncio
+
+from src.infrastructure.repository.loader import DataLoader
+
+
+def test_concurrent_loads_share_one_batch():
+    batches = []
+
+    async def batch_load(keys):
+        batches.append(sorted(keys))
+        await asyncio.sleep(0)
+        return {key: key * 10 for key in keys if key != 3}
+
+    async def load_all():
+        loader = DataLoader(batch_load, max_batch_size=10)
+        values = await asyncio.gather(*(loader.load(key) for key in (1, 2, 3, 2)))
+        return values, loader._runs
+
+    values, runs = asyncio.run(load_all())
+
+    assert values == [10, 20, None, 20]
+    assert batches == [[1, 2, 3]]
+    assert not runs
@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.infrastructure.repository.post import PostRepository
+from src.metrics import disable_metrics, enable_metrics, labels, service_errors
+
+
+@pytest.fixture
+def metrics():
+    enable_metrics()
+    yield
+    disable_metrics()
+
+
+class FailingSession:
+    async def execute(self, *args, **kwargs):
+        raise OperationalError('SELECT 1', {}, ConnectionError('connection refused'))
+
+
+def test_repository_error_increments_error_counter(metrics):
+    label_pairs = labels(layer='repository', service='post', method='get_post_by_id')
+    before = service_errors.value(label_pairs)
+
+    assert asyncio.run(PostRepository(FailingSession()).get_post_by_id('6f1d3b9e-3f4c-4b8e-9a55-0c2d7c1e8a10')) is None
+
+    assert service_errors.value(label_pairs) == before + 1
@@ -0,0 +1,57 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.application.exceptions.exp_repository import StreamInterruptedException
+from src.infrastructure.repository.post import PostRepository
+
+POST_ID = '0b6f3c1e-5d2a-4f7e-8c91-3a4b5c6d7e8f'
+AUTHOR_ID = '6f1d3b9e-3f4c-4b8e-9a55-0c2d7c1e8a10'
+
+
+class BrokenStream:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self._rows:
+            yield row
+        raise OperationalError('SELECT', {}, ConnectionError('connection reset'))
+
+
+class StreamSession:
+    def __init__(self, rows):
+        self._rows = rows
+
+    async def stream(self, query):
+        return BrokenStream(self._rows)
+
+
+def post_row():
+    return SimpleNamespace(
+        uuid=POST_ID,
+        title='Заголовок',
+        text='Текст',
+        is_published=True,
+        is_deleted=False,
+        created_at=datetime(2024, 1, 1),
+        author_id=AUTHOR_ID,
+    )
+
+
+def test_stream_posts_raises_when_interrupted():
+    received = []
+
+    async def consume():
+        async for post in PostRepository(StreamSession([post_row()])).stream_posts():
+            received.append(post.uuid)
+
+    with pytest.raises(StreamInterruptedException):
+        asyncio.run(consume())
+    assert received == [POST_ID]
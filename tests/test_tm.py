@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.tm import TransactionManager
+from tests.fakes import Session
+
+
+def run(scenario):
+    session = Session()
+    tm = TransactionManager(session)
+    calls = []
+    result = asyncio.run(scenario(tm, calls))
+    return session.events, calls, result
+
+
+def test_commit_inside_unit_of_work_is_deferred():
+    async def scenario(tm, calls):
+        async with tm.unit_of_work() as unit:
+            tm.after_commit(lambda: calls.append('first'))
+            await tm.commit()
+            tm.after_commit(lambda: calls.append('second'))
+            await tm.commit()
+            assert tm._session.events == []
+        return unit
+
+    events, calls, unit = run(scenario)
+
+    assert events == ['commit']
+    assert calls == ['first', 'second']
+    assert not unit.rolled_back
+
+
+def test_rollback_inside_unit_of_work_marks_it_rollback_only():
+    async def scenario(tm, calls):
+        async with tm.unit_of_work() as unit:
+            tm.after_commit(lambda: calls.append('dropped'))
+            await tm.rollback()
+            await tm.commit()
+            assert tm._session.events == []
+        return unit
+
+    events, calls, unit = run(scenario)
+
+    assert events == ['rollback']
+    assert calls == []
+    assert unit.rolled_back
+
+
+def test_savepoint_rollback_drops_its_after_commit_hooks():
+    async def scenario(tm, calls):
+        async with tm.unit_of_work():
+            tm.after_commit(lambda: calls.append('outer'))
+            async with tm.unit_of_work() as failed:
+                tm.after_commit(lambda: calls.append('failed'))
+                await tm.rollback()
+            async with tm.unit_of_work() as retried:
+                tm.after_commit(lambda: calls.append('retried'))
+        return failed, retried
+
+    events, calls, (failed, retried) = run(scenario)
+
+    assert events == ['savepoint 1', 'rollback to 1', 'savepoint 2', 'release 2', 'commit']
+    assert calls == ['outer', 'retried']
+    assert failed.rolled_back and not retried.rolled_back
+
+
+def test_exception_in_unit_of_work_rolls_back():
+    async def scenario(tm, calls):
+        with pytest.raises(ValueError):
+            async with tm.unit_of_work():
+                tm.after_commit(lambda: calls.append('dropped'))
+                raise ValueError('ошибка')
+
+    events, calls, _ = run(scenario)
+
+    assert events == ['rollback']
+    assert calls == []
+
+
+def test_failing_after_commit_hook_does_not_stop_the_others():
+    def failing():
+        raise RuntimeError('сбой обработчика')
+
+    async def scenario(tm, calls):
+        async with tm.unit_of_work():
+            tm.after_commit(failing)
+            tm.after_commit(lambda: calls.append('next'))
+
+    events, calls, _ = run(scenario)
+
+    assert events == ['commit']
+    assert calls == ['next']
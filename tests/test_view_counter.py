@@ -0,0 +1,72 @@
+import asyncio
+import uuid
+
+from sqlalchemy.exc import OperationalError
+
+from src.infrastructure.view_counter import ViewCounter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Session:
+    def __init__(self, database):
+        self._database = database
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        self._database.attempts += 1
+        if not self._database.available:
+            raise OperationalError('INSERT', {}, ConnectionError('connection refused'))
+
+    async def commit(self):
+        pass
+
+
+class Database:
+    def __init__(self):
+        self.available = False
+        self.attempts = 0
+
+    def __call__(self):
+        return Session(self)
+
+
+def test_failed_flush_backs_off_until_retry_delay_passes():
+    database, clock = Database(), Clock()
+    counter = ViewCounter(database, flush_interval=5.0, max_pending=2, max_retry_delay=20.0, timer=clock)
+    post_ids = [uuid.uuid4() for _ in range(3)]
+
+    async def record_views():
+        for post_id in post_ids:
+            counter.record(post_id)
+            await asyncio.sleep(0)
+
+    asyncio.run(record_views())
+    assert database.attempts == 1
+    assert counter.pending == 3
+
+    clock.now = 4.0
+    asyncio.run(record_views())
+    assert database.attempts == 1
+
+    clock.now = 5.0
+    assert asyncio.run(counter.flush()) == 0
+    assert database.attempts == 2
+    assert counter._retry_at == 15.0
+
+    database.available = True
+    clock.now = 15.0
+    assert asyncio.run(counter.flush()) == 6
+    assert counter.pending == 0
+    assert counter._retry_at == 0.0